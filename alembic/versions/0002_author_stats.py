@@ -0,0 +1,52 @@
+"""author_stats table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('author_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.Column('published_count', sa.Integer(), nullable=False),
+    sa.Column('total_reads', sa.BigInteger(), nullable=False),
+    sa.Column('total_likes', sa.BigInteger(), nullable=False),
+    sa.Column('total_unlikes', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # Backfill from existing blogs; afterwards write paths and the nightly repair keep it current.
+    op.execute(
+        """
+        INSERT INTO author_stats (user_id, post_count, published_count, total_reads, total_likes, total_unlikes)
+        SELECT author_id,
+               count(*),
+               sum(CASE WHEN is_published THEN 1 ELSE 0 END),
+               sum(CASE WHEN is_published THEN coalesce(read_count, 0) ELSE 0 END),
+               sum(CASE WHEN is_published THEN coalesce(likes, 0) ELSE 0 END),
+               sum(CASE WHEN is_published THEN coalesce(unlikes, 0) ELSE 0 END)
+        FROM blogs
+        GROUP BY author_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('author_stats')
@@ -0,0 +1,55 @@
+"""blog change sequence and tombstones
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('blog_change_seq')))
+    op.add_column('blogs', sa.Column('change_seq', sa.BigInteger(), nullable=True))
+    # Existing blogs get sequence numbers in the order they last changed.
+    op.execute(
+        """
+        UPDATE blogs SET change_seq = ordered.seq
+        FROM (
+            SELECT id, row_number() OVER (ORDER BY coalesce(updated_at, created_at), id) AS seq
+            FROM blogs
+        ) AS ordered
+        WHERE ordered.id = blogs.id
+        """
+    )
+    op.execute("SELECT setval('blog_change_seq', coalesce((SELECT max(change_seq) FROM blogs), 0) + 1, false)")
+    op.alter_column('blogs', 'change_seq', nullable=False)
+    op.create_index(op.f('ix_blogs_change_seq'), 'blogs', ['change_seq'], unique=False)
+    op.create_table('blog_tombstones',
+    sa.Column('blog_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('blog_id')
+    )
+    op.create_index(op.f('ix_blog_tombstones_change_seq'), 'blog_tombstones', ['change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_blog_tombstones_change_seq'), table_name='blog_tombstones')
+    op.drop_table('blog_tombstones')
+    op.drop_index(op.f('ix_blogs_change_seq'), table_name='blogs')
+    op.drop_column('blogs', 'change_seq')
+    op.execute(sa.schema.DropSequence(sa.Sequence('blog_change_seq')))
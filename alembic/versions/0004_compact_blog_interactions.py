@@ -0,0 +1,118 @@
+"""compact blog_interactions
+
+Rewrites blog_interactions as (blog_id, user_id) -> flags, where flags packs
+seen=1, liked=2 and unliked=4, and drops the surrogate id and created_at.
+
+Rows are copied into a new table in id-range batches, each committed on its
+own so the copy does not hold one long transaction. Rows written while the
+copy runs are caught up again just before the tables are swapped.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 50000
+
+FLAGS = (
+    "bit_or((CASE WHEN coalesce(seen, false) THEN 1 ELSE 0 END)"
+    " | (CASE WHEN coalesce(liked, false) THEN 2 ELSE 0 END)"
+    " | (CASE WHEN coalesce(unliked, false) THEN 4 ELSE 0 END))::smallint"
+)
+
+
+def _copy(where: str, on_conflict: str) -> str:
+    # The old table has no unique (blog_id, user_id); duplicates are merged.
+    return f"""
+        INSERT INTO blog_interactions_compact (blog_id, user_id, flags, updated_at)
+        SELECT blog_id, user_id, {FLAGS}, max(coalesce(updated_at, created_at))
+        FROM blog_interactions
+        WHERE {where}
+        GROUP BY blog_id, user_id
+        ON CONFLICT (blog_id, user_id) DO UPDATE SET {on_conflict}
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('blog_interactions_compact',
+    sa.Column('blog_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('flags', sa.SmallInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['blog_id'], ['blogs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('blog_id', 'user_id', name='blog_interactions_compact_pkey')
+    )
+
+    bind = op.get_bind()
+    started_at, max_id = bind.execute(sa.text("SELECT now(), coalesce(max(id), 0) FROM blog_interactions")).one()
+
+    with op.get_context().autocommit_block():
+        for start in range(0, max_id, BATCH_SIZE):
+            bind.execute(
+                sa.text(_copy(
+                    "id > :start AND id <= :end",
+                    "flags = blog_interactions_compact.flags | excluded.flags, "
+                    "updated_at = greatest(blog_interactions_compact.updated_at, excluded.updated_at)",
+                )),
+                {"start": start, "end": start + BATCH_SIZE},
+            )
+
+    # Catch up on pairs written during the copy, recomputed from all of their rows.
+    op.execute("LOCK TABLE blog_interactions IN EXCLUSIVE MODE")
+    bind.execute(
+        sa.text(_copy(
+            "(blog_id, user_id) IN ("
+            " SELECT blog_id, user_id FROM blog_interactions WHERE id > :max_id OR updated_at >= :started_at)",
+            "flags = excluded.flags, updated_at = excluded.updated_at",
+        )),
+        {"max_id": max_id, "started_at": started_at},
+    )
+
+    op.drop_table('blog_interactions')
+    op.rename_table('blog_interactions_compact', 'blog_interactions')
+    op.execute("ALTER TABLE blog_interactions RENAME CONSTRAINT blog_interactions_compact_pkey TO blog_interactions_pkey")
+    op.create_index('ix_blog_interactions_user_id', 'blog_interactions', ['user_id'], unique=False)
+    op.alter_column('blog_interactions', 'flags', server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('blog_interactions_wide',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('blog_id', sa.Integer(), nullable=False),
+    sa.Column('seen', sa.Boolean(), nullable=True),
+    sa.Column('liked', sa.Boolean(), nullable=True),
+    sa.Column('unliked', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['blog_id'], ['blogs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name='blog_interactions_wide_pkey')
+    )
+    op.execute(
+        """
+        INSERT INTO blog_interactions_wide (user_id, blog_id, seen, liked, unliked, created_at, updated_at)
+        SELECT user_id, blog_id, flags & 1 <> 0, flags & 2 <> 0, flags & 4 <> 0, updated_at, updated_at
+        FROM blog_interactions
+        """
+    )
+    op.drop_table('blog_interactions')
+    op.rename_table('blog_interactions_wide', 'blog_interactions')
+    op.execute("ALTER TABLE blog_interactions RENAME CONSTRAINT blog_interactions_wide_pkey TO blog_interactions_pkey")
+    op.execute("ALTER SEQUENCE blog_interactions_wide_id_seq RENAME TO blog_interactions_id_seq")
+    op.create_index(op.f('ix_blog_interactions_id'), 'blog_interactions', ['id'], unique=False)
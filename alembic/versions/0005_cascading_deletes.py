@@ -0,0 +1,67 @@
+"""cascading deletes and soft-delete columns
+
+Deleting a blog or user no longer loads its children: the foreign keys that
+still lacked it get ON DELETE CASCADE, and every foreign key the cascade
+follows gets an index. Large blogs and accounts are soft-deleted through
+deleted_at and purged in batches by the background worker.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table) for the keys created without ON DELETE CASCADE.
+CASCADED = (
+    ('blogs', 'author_id', 'users'),
+    ('comments', 'user_id', 'users'),
+    ('comments', 'blog_id', 'blogs'),
+)
+
+INDEXED = (
+    ('blogs', 'author_id'),
+    ('comments', 'user_id'),
+    ('comments', 'blog_id'),
+    ('attachments', 'blog_id'),
+    ('engagement_events', 'blog_id'),
+)
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referred in CASCADED:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blogs', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_blogs_deleted_at'), 'blogs', ['deleted_at'], unique=False)
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_users_deleted_at'), 'users', ['deleted_at'], unique=False)
+    for table, column in INDEXED:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_keys(None)
+    for table, column in INDEXED:
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+    op.drop_index(op.f('ix_users_deleted_at'), table_name='users')
+    op.drop_column('users', 'deleted_at')
+    op.drop_index(op.f('ix_blogs_deleted_at'), table_name='blogs')
+    op.drop_column('blogs', 'deleted_at')
@@ -0,0 +1,31 @@
+"""blog was published
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blogs', sa.Column('was_published', sa.Boolean(), server_default=sa.false(), nullable=False))
+    # Publishing history is unknown; current drafts are treated as never published.
+    op.execute("UPDATE blogs SET was_published = true WHERE is_published")
+    op.alter_column('blogs', 'was_published', server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('blogs', 'was_published')
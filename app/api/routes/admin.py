@@ -1,16 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Literal, Optional
+from datetime import date, datetime, timedelta, timezone
 
 from app.db.session import get_db
 from app.models.user import User
-from app.schemas.user import UserOut
+from app.schemas.user import AdminUserOut, PaginatedAdminUsers, UserOut
+from app.crud.user import get_users_with_stats, set_users_active
+from app.crud.blog import set_blogs_published
+from app.crud.export import iter_export
+from app.core import cache
+from app.core.slow_queries import clear_slow_queries, get_slow_queries
+from app.schemas.admin import BlogBulkPublishUpdate, BulkUpdateResult, UserBulkActiveUpdate
+from app.crud.analytics import get_engagement_series, get_top_blogs
+from app.schemas.analytics import AnalyticsOut, EngagementPoint, TopBlog
 from app.core.security import get_current_user
 
 router = APIRouter()
 
-@router.get("/users", response_model=List[UserOut])
+@router.get("/users", response_model=PaginatedAdminUsers)
 def list_non_superusers(
+    cursor: Optional[int] = Query(None, ge=1, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    is_active: Optional[bool] = Query(None),
+    q: Optional[str] = Query(None, description="Username or email prefix"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -22,8 +36,21 @@ def list_non_superusers(
             detail="You do not have enough permissions",
         )
 
-    users = db.query(User).filter(User.is_superuser == False).all()
-    return users
+    rows = get_users_with_stats(db, cursor=cursor, limit=limit, is_active=is_active, q=q)
+
+    items = []
+    for user, blog_count, comment_count, total_likes in rows[:limit]:
+        item = AdminUserOut.model_validate(user, from_attributes=True)
+        item.blog_count = blog_count
+        item.comment_count = comment_count
+        item.total_likes = total_likes
+        items.append(item)
+
+    return {
+        "items": items,
+        "next_cursor": items[-1].id if len(rows) > limit else None,
+        "limit": limit,
+    }
 
 @router.patch("/users/{user_id}/toggle-active", response_model=UserOut)
 def toggle_user_active(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -36,5 +63,103 @@ def toggle_user_active(user_id: int, db: Session = Depends(get_db), current_user
 
     user.is_active = not user.is_active
     db.commit()
-    db.refresh(user)
+    cache.invalidate(cache.USERS, [user.id])
     return user
+
+@router.post("/users/bulk-active", response_model=BulkUpdateResult)
+def bulk_set_users_active(
+    update_in: UserBulkActiveUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    current = update_in.filter.is_active if update_in.filter else None
+    q = update_in.filter.q if update_in.filter else None
+    changed = set_users_active(db, update_in.is_active, ids=update_in.ids, current=current, q=q)
+    cache.invalidate(cache.USERS, changed)
+
+    return {"updated": len(changed), "ids": changed}
+
+@router.post("/blogs/bulk-publish", response_model=BulkUpdateResult)
+def bulk_set_blogs_published(
+    update_in: BlogBulkPublishUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    author_id = update_in.filter.author_id if update_in.filter else None
+    current = update_in.filter.is_published if update_in.filter else None
+    changed = set_blogs_published(db, update_in.is_published, ids=update_in.ids, author_id=author_id, current=current)
+    if changed:
+        cache.invalidate(cache.BLOGS, changed)
+        cache.invalidate(cache.FEEDS)
+
+    return {"updated": len(changed), "ids": changed}
+
+
+@router.get("/analytics", response_model=AnalyticsOut)
+def get_analytics(
+    start: Optional[date] = Query(None, description="First day (UTC), defaults to 30 days ago"),
+    end: Optional[date] = Query(None, description="Last day (UTC), defaults to today"),
+    blog_id: Optional[int] = Query(None),
+    metric: Literal["reads", "likes", "unlikes", "comments"] = Query("likes"),
+    top: int = Query(10, ge=0, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    series = get_engagement_series(db, start, end, blog_id=blog_id)
+    top_blogs = get_top_blogs(db, start, end, metric=metric, limit=top) if top else []
+
+    return {
+        "start": start,
+        "end": end,
+        "series": [EngagementPoint.model_validate(row, from_attributes=True) for row in series],
+        "top_blogs": [TopBlog.model_validate(row, from_attributes=True) for row in top_blogs],
+    }
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@router.get("/export/{resource}")
+def export_table(
+    resource: Literal["blogs", "comments", "interactions"],
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    since: Optional[datetime] = Query(None, description="Only rows created or changed at or after this time"),
+    current_user: User = Depends(get_current_user),
+):
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    filename = f"{resource}.{format}"
+    return StreamingResponse(
+        iter_export(resource, format, since),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/slow-queries")
+def list_slow_queries(current_user: User = Depends(get_current_user)):
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    return {"items": get_slow_queries()}
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def reset_slow_queries(current_user: User = Depends(get_current_user)):
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    clear_slow_queries()
@@ -2,17 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas.attachment import AttachmentCreateWithoutBlogId, AttachmentOut, AttachmentCreate
-from app.crud.attachment import create_attachment, get_attachments_by_blog
+from app.crud.attachment import create_attachment, create_attachments, get_attachments_by_blog
+from app.crud.media import enqueue_media_deletions
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.blog import Blog,Attachment
-import cloudinary.uploader
 
 
 router = APIRouter()
 
+BULK_MAX_ATTACHMENTS = 50
+
 @router.post("/blog/{blog_id}", response_model=AttachmentOut)
 def create_attachment_endpoint(
     blog_id: int,
@@ -32,6 +34,25 @@ def create_attachment_endpoint(
     attachment_schema = AttachmentCreate(**attachment_data)
     return create_attachment(db, attachment_schema)
 
+@router.post("/blog/{blog_id}/bulk", response_model=List[AttachmentOut])
+def create_attachments_bulk_endpoint(
+    blog_id: int,
+    attachments_in: List[AttachmentCreateWithoutBlogId],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if len(attachments_in) > BULK_MAX_ATTACHMENTS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ATTACHMENTS} attachments can be added at once")
+
+    blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    if not blog:
+        raise HTTPException(status_code=404, detail="Blog not found")
+
+    if blog.author_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to add attachment to this blog")
+
+    return create_attachments(db, blog_id, attachments_in)
+
 @router.delete("/{attachment_id}")
 def delete_attachment_endpoint(
     attachment_id: int,
@@ -49,17 +70,14 @@ def delete_attachment_endpoint(
     if blog.author_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this attachment")
 
-    result = cloudinary.uploader.destroy(attachment.file_public_id)
-    if result.get("result") != "ok":
-        raise HTTPException(status_code=500, detail="Failed to delete from Cloudinary")
-
+    enqueue_media_deletions(db, [attachment.file_public_id])
     db.delete(attachment)
     db.commit()
 
     return {"id": attachment_id}
 
 @router.get("/blog/{blog_id}", response_model=List[AttachmentOut])
-def get_attachments_endpoint(blog_id: int, db: Session = Depends(get_db)):
+def get_attachments_endpoint(blog_id: int, db: Session = Depends(get_read_db)):
     return get_attachments_by_blog(db, blog_id)
 
 
@@ -4,7 +4,8 @@ from datetime import timedelta, datetime, timezone
 import time
 import hashlib
 
-from app.db.session import SessionLocal
+from app.db.session import get_db
+from app.core import cache
 from app import crud
 from app.schemas.user import UserLogin, UserCreate, UserSelfUpdate, UserOut,ChangePassword
 from app.core.security import create_access_token, create_refresh_token, verify_token, get_current_user, get_password_hash, verify_password 
@@ -15,13 +16,6 @@ from app.models.user import User
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 
 @router.post("/register")
 def create_user_route(user: UserCreate, response: Response, db: Session = Depends(get_db)):
@@ -70,7 +64,7 @@ def login(user_cred: UserLogin, response: Response, db: Session = Depends(get_db
     
     user.last_login = datetime.now(timezone.utc)
     db.commit()
-    db.refresh(user)
+    cache.invalidate(cache.USERS, [user.id])
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(data={"sub": user.email}, expires_delta=access_token_expires)
@@ -151,7 +145,7 @@ def update_self(
         user.profile_pic = update_data["profile_pic"]
 
     db.commit()
-    db.refresh(user)
+    cache.invalidate(cache.USERS, [user.id])
 
     return UserOut.model_validate(user, from_attributes=True)
 
@@ -176,7 +170,7 @@ def change_password(
     user.hashed_password = new_hashed
 
     db.commit()
-    db.refresh(user)
+    cache.invalidate(cache.USERS, [user.id])
 
     return {"detail": "Password updated successfully"}
 
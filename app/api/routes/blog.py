@@ -1,28 +1,111 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import case
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from app.models.user import User
-from app.models.blog import Blog, Comment
+from app.models.blog import Blog, BlogTombstone, Comment
 from app.models.blog_interaction import BlogInteraction
-from app.schemas.blog import BlogCreate, BlogOut, BlogUpdate
+from app.schemas.blog import (
+    BlogChangesOut, BlogContentOut, BlogContentPatch, BlogCreate, BlogOut, BlogRemovedOut, BlogUpdate,
+)
+from app.schemas.attachment import AttachmentOut
 from app.schemas.interaction import InteractionOut
 from app.schemas.comment import CommentCreate, CommentOut, CommentUpdate, PaginatedComments
 from app.schemas.user import BlogAuthorOut
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_db, get_read_db
 from app.core.security import get_optional_user, get_current_user
-from datetime import datetime, timezone
+from app.core import cache
+from app.core.live_counters import hub
+from app.core.interaction_cache import NO_INTERACTION, InteractionState, interaction_cache
+from app.crud.analytics import record_engagement
+from app.crud.author_stats import bump_author_stats, published_totals
+from app.crud.blog import apply_content_edits, get_blog_changes, remove_blog, update_blog_content
+from app.core.config import CHANGES_SETTLE_SECONDS
+from datetime import datetime, timedelta, timezone
 from math import ceil
 
 router = APIRouter()
 
+BATCH_MAX_IDS = 100
+CHANGES_MAX_LIMIT = 500
+CONTENT_PATCH_MAX_EDITS = 100
+INCLUDE_OPTIONS = {"attachments"}
+
+
+def parse_includes(
+    include: Optional[str] = Query(None, description="Comma separated relations to embed, e.g. attachments"),
+) -> Set[str]:
+    includes = {item.strip() for item in (include or "").split(",") if item.strip()}
+    unknown = includes - INCLUDE_OPTIONS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}",
+        )
+    return includes
+
+
+def parse_blog_ids(ids: str) -> List[int]:
+    try:
+        blog_ids = list(dict.fromkeys(int(blog_id) for blog_id in ids.split(",") if blog_id.strip()))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid blog ids")
+
+    if len(blog_ids) > BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_MAX_IDS} blog ids can be requested at once",
+        )
+    return blog_ids
+
+
+def published_blog_ids(blog_ids: List[int]) -> List[int]:
+    # Streams are long-lived, so the check uses its own session instead of
+    # holding a request-scoped one open.
+    db = SessionLocal(info={"read_only": True})
+    try:
+        return [row.id for row in db.query(Blog.id).filter(Blog.id.in_(blog_ids), Blog.is_published == True)]
+    finally:
+        db.close()
+
+
+def live_response(blog_ids: List[int]) -> StreamingResponse:
+    return StreamingResponse(
+        hub.stream(blog_ids),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def with_includes(query, includes: Set[str]):
+    if "attachments" in includes:
+        query = query.options(selectinload(Blog.attachments))
+    return query
+
+
+def interaction_out(user_id: int, blog_id: int, state: InteractionState) -> InteractionOut:
+    if state == NO_INTERACTION:
+        return InteractionOut(seen=False, liked=False, unliked=False)
+    return InteractionOut(user_id=user_id, blog_id=blog_id, **state._asdict())
+
+
+def embed_includes(blog_out: BlogOut, blog: Blog, includes: Set[str]):
+    if "attachments" in includes:
+        blog_out.attachments = [
+            AttachmentOut.model_validate(attachment, from_attributes=True)
+            for attachment in blog.attachments
+        ]
+
 
 @router.get("/", response_model=dict)
 def get_blogs(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1),
-    db: Session = Depends(get_db),
+    includes: Set[str] = Depends(parse_includes),
+    db: Session = Depends(get_read_db),
     current_user: Optional[User] = Depends(get_optional_user), 
 ):
     skip = (page - 1) * page_size
@@ -39,7 +122,7 @@ def get_blogs(
     total_pages = ceil(total_items / page_size)
 
     blogs = (
-        query
+        with_includes(query, includes)
         .options(joinedload(Blog.author))
         .order_by(Blog.created_at.desc())
         .offset(skip)
@@ -47,21 +130,16 @@ def get_blogs(
         .all()
     )
 
+    interactions = interaction_cache.lookup(db, current_user.id, [blog.id for blog in blogs]) if current_user else {}
+
     result = []
     for blog in blogs:
         blog_out = BlogOut.model_validate(blog, from_attributes=True)
         blog_out.author = BlogAuthorOut.model_validate(blog.author, from_attributes=True)
+        embed_includes(blog_out, blog, includes)
 
         if current_user:
-            interaction = (
-                db.query(BlogInteraction)
-                .filter_by(blog_id=blog.id, user_id=current_user.id)
-                .first()
-            )
-            if interaction:
-                blog_out.interaction = InteractionOut.model_validate(interaction, from_attributes=True)
-            else:
-                blog_out.interaction = InteractionOut(seen=False, liked=False, unliked=False)
+            blog_out.interaction = interaction_out(current_user.id, blog.id, interactions[blog.id])
 
         result.append(blog_out)
 
@@ -78,6 +156,7 @@ def get_blogs(
 def get_my_blogs(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1),
+    includes: Set[str] = Depends(parse_includes),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user), 
 ):
@@ -98,7 +177,7 @@ def get_my_blogs(
     total_pages = ceil(total_items / page_size)
 
     blogs = (
-        query
+        with_includes(query, includes)
         .options(joinedload(Blog.author))
         .order_by(Blog.created_at.desc())
         .offset(skip)
@@ -106,21 +185,16 @@ def get_my_blogs(
         .all()
     )
 
+    interactions = interaction_cache.lookup(db, current_user.id, [blog.id for blog in blogs])
+
     result = []
     for blog in blogs:
         blog_out = BlogOut.model_validate(blog, from_attributes=True)
         blog_out.author = BlogAuthorOut.model_validate(blog.author, from_attributes=True)
+        embed_includes(blog_out, blog, includes)
 
         if blog.author_id == current_user.id:
-            interaction = (
-                db.query(BlogInteraction)
-                .filter_by(blog_id=blog.id, user_id=current_user.id)
-                .first()
-            )
-            if interaction:
-                blog_out.interaction = InteractionOut.model_validate(interaction, from_attributes=True)
-            else:
-                blog_out.interaction = InteractionOut(seen=False, liked=False, unliked=False)
+            blog_out.interaction = interaction_out(current_user.id, blog.id, interactions[blog.id])
 
         result.append(blog_out)
 
@@ -149,23 +223,125 @@ def create_blog(
         image=blog_in.image,
         is_published=blog_in.is_published,
         author_id=current_user.id,
+        # Without an explicit value, eager_defaults re-selects the onupdate column after the INSERT.
+        updated_at=None,
     )
 
     db.add(new_blog)
+    bump_author_stats(
+        db, current_user.id, post_count=1, **(published_totals(new_blog) if new_blog.is_published else {})
+    )
     db.commit()
-    db.refresh(new_blog)
 
     return BlogOut.model_validate(new_blog, from_attributes=True)
 
 
+@router.get("/batch", response_model=List[BlogOut])
+def get_blogs_batch(
+    ids: str = Query(..., description="Comma separated blog ids"),
+    includes: Set[str] = Depends(parse_includes),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    blog_ids = parse_blog_ids(ids)
+    if not blog_ids:
+        return []
+
+    query = with_includes(db.query(Blog), includes).options(joinedload(Blog.author)).filter(Blog.id.in_(blog_ids))
+
+    if not current_user.is_superuser:
+        query = query.filter(Blog.is_published == True)
+
+    blogs = {blog.id: blog for blog in query.all()}
+    interactions = interaction_cache.lookup(db, current_user.id, list(blogs))
+
+    result = []
+    for blog_id in blog_ids:
+        blog = blogs.get(blog_id)
+        if not blog:
+            continue
+
+        blog_out = BlogOut.model_validate(blog, from_attributes=True)
+        blog_out.author = BlogAuthorOut.model_validate(blog.author, from_attributes=True)
+        embed_includes(blog_out, blog, includes)
+
+        blog_out.interaction = interaction_out(current_user.id, blog_id, interactions[blog_id])
+
+        result.append(blog_out)
+
+    return result
+
+
+@router.get("/changes", response_model=BlogChangesOut)
+def get_blogs_changes(
+    since: int = Query(0, ge=0, description="next_token from the previous call; 0 for a full sync"),
+    limit: int = Query(100, ge=1, le=CHANGES_MAX_LIMIT),
+    db: Session = Depends(get_read_db),
+    current_user: Optional[User] = Depends(get_optional_user),
+):
+    blogs, tombstones = get_blog_changes(db, since, limit)
+    entries = sorted(
+        [(blog.change_seq, blog.updated_at or blog.created_at, blog) for blog in blogs]
+        + [(tombstone.change_seq, tombstone.deleted_at, tombstone) for tombstone in tombstones],
+        key=lambda entry: entry[0],
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    include_unpublished = bool(current_user and current_user.is_superuser)
+    visible = [
+        blog for _, _, blog in entries
+        if isinstance(blog, Blog) and (blog.is_published or include_unpublished)
+    ]
+    interactions = interaction_cache.lookup(db, current_user.id, [blog.id for blog in visible]) if current_user else {}
+
+    changed, removed = [], []
+    next_token = entries[-1][0] if entries else since
+    settled_before = datetime.now(timezone.utc) - timedelta(seconds=CHANGES_SETTLE_SECONDS)
+    for change_seq, changed_at, item in entries:
+        if changed_at is not None and changed_at.replace(tzinfo=changed_at.tzinfo or timezone.utc) >= settled_before:
+            # Recent changes are sent, but the token stays behind them in case an
+            # older change_seq is still uncommitted; clients apply changes idempotently.
+            next_token = min(next_token, max(since, change_seq - 1))
+
+        if isinstance(item, BlogTombstone):
+            removed.append(BlogRemovedOut(id=item.blog_id, reason="deleted"))
+        elif not (item.is_published or include_unpublished):
+            # Drafts that were never public stay unknown to everyone else.
+            if item.was_published:
+                removed.append(BlogRemovedOut(id=item.id, reason="unpublished"))
+        else:
+            blog_out = BlogOut.model_validate(item, from_attributes=True)
+            blog_out.author = BlogAuthorOut.model_validate(item.author, from_attributes=True)
+            if current_user:
+                blog_out.interaction = interaction_out(current_user.id, item.id, interactions[item.id])
+            changed.append(blog_out)
+
+    if entries and next_token < entries[-1][0]:
+        # The token is held back, so an immediate refetch would return this same
+        # page; make clients wait for their normal poll interval instead.
+        has_more = False
+
+    return BlogChangesOut(changed=changed, removed=removed, next_token=next_token, has_more=has_more)
+
+
+@router.get("/live")
+async def stream_blogs_counters(ids: str = Query(..., description="Comma separated blog ids")):
+    blog_ids = await run_in_threadpool(published_blog_ids, parse_blog_ids(ids))
+    if not blog_ids:
+        raise HTTPException(status_code=404, detail="Blog not found")
+    return live_response(blog_ids)
+
+
 @router.get("/{blog_id}", response_model=BlogOut)
 def get_blog_detail(
     blog_id: int,
-    db: Session = Depends(get_db),
+    includes: Set[str] = Depends(parse_includes),
+    db: Session = Depends(get_read_db),
     current_user: Optional[User] = Depends(get_current_user) 
 ):
     blog = (
-        db.query(Blog)
+        with_includes(db.query(Blog), includes)
         .filter(Blog.id == blog_id)
         .first()
     )
@@ -178,22 +354,23 @@ def get_blog_detail(
 
     blog_out = BlogOut.model_validate(blog, from_attributes=True)
     blog_out.author = BlogAuthorOut.model_validate(blog.author, from_attributes=True)
+    embed_includes(blog_out, blog, includes)
 
     if current_user:
-        interaction = (
-            db.query(BlogInteraction)
-            .filter_by(blog_id=blog.id, user_id=current_user.id)
-            .first()
-        )
-        if interaction:
-            blog_out.interaction = InteractionOut.model_validate(interaction, from_attributes=True)
-        else:
-            blog_out.interaction = InteractionOut(seen=False, liked=False, unliked=False)
+        interactions = interaction_cache.lookup(db, current_user.id, [blog.id])
+        blog_out.interaction = interaction_out(current_user.id, blog.id, interactions[blog.id])
 
     return blog_out
 
 
 
+@router.get("/{blog_id}/live")
+async def stream_blog_counters(blog_id: int):
+    if not await run_in_threadpool(published_blog_ids, [blog_id]):
+        raise HTTPException(status_code=404, detail="Blog not found")
+    return live_response([blog_id])
+
+
 @router.patch("/{blog_id}", response_model=BlogOut)
 def update_blog(
     blog_id: int,
@@ -202,7 +379,12 @@ def update_blog(
     current_user: User = Depends(get_current_user),
 ):
 
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    update_data = blog_in.model_dump(exclude_unset=True)
+    query = db.query(Blog).filter(Blog.id == blog_id)
+    if "content" in update_data:
+        # Hold the row so concurrent content writes cannot both claim the same next version.
+        query = query.with_for_update()
+    blog = query.first()
 
     if not blog:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blog not found")
@@ -210,17 +392,84 @@ def update_blog(
     if blog.author_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this blog")
 
-    update_data = blog_in.model_dump(exclude_unset=True)
+    was_published = blog.is_published
 
+    if "content" in update_data and update_data["content"] != blog.content:
+        blog.content_version += 1
     for key, value in update_data.items():
         setattr(blog, key, value)
 
+    if blog.is_published != was_published:
+        bump_author_stats(db, blog.author_id, **published_totals(blog, 1 if blog.is_published else -1))
     db.commit()
-    db.refresh(blog)
 
     return BlogOut.model_validate(blog, from_attributes=True)
 
 
+@router.patch("/{blog_id}/content", response_model=BlogContentOut)
+def patch_blog_content(
+    blog_id: int,
+    patch: BlogContentPatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Apply splice edits to the content, provided it is still at ``base_version``.
+
+    Answers 409 with the current version when the content has moved on, and
+    writes nothing when the edits leave the content as it was.
+    """
+    if len(patch.edits) > CONTENT_PATCH_MAX_EDITS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {CONTENT_PATCH_MAX_EDITS} edits can be applied at once",
+        )
+
+    blog = db.query(Blog).filter(Blog.id == blog_id).first()
+
+    if not blog:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blog not found")
+
+    if blog.author_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this blog")
+
+    if blog.content_version != patch.base_version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Blog content is at version {blog.content_version}, not {patch.base_version}",
+        )
+
+    try:
+        content = apply_content_edits(blog.content, patch.edits)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
+    if content == blog.content:
+        return BlogContentOut(
+            id=blog.id,
+            content_version=blog.content_version,
+            content_length=len(content),
+            changed=False,
+            updated_at=blog.updated_at,
+        )
+
+    row = update_blog_content(db, blog.id, patch.base_version, content)
+    if row is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Blog content has changed since version {patch.base_version}",
+        )
+    db.commit()
+
+    return BlogContentOut(
+        id=blog.id,
+        content_version=row.content_version,
+        content_length=len(content),
+        changed=True,
+        updated_at=row.updated_at,
+    )
+
+
 @router.post("/{blog_id}/mark-seen", status_code=200)
 def mark_blog_seen(
     blog_id: int,
@@ -242,9 +491,12 @@ def mark_blog_seen(
             interaction.seen = True
             blog.read_count += 1
             interaction.updated_at = datetime.now(timezone.utc)
+            record_engagement(db, blog_id, reads=1)
+            if blog.is_published:
+                bump_author_stats(db, blog.author_id, total_reads=1)
             db.commit()
-            db.refresh(blog)
-            db.refresh(interaction)
+            interaction_cache.record(current_user.id, blog_id, InteractionState(True, interaction.liked, interaction.unliked))
+            hub.publish(blog_id, counts={"read_count": blog.read_count}, reads=1)
             return {"message": "Marked as seen", "read_count": blog.read_count, "id": blog_id}
         else:
             return {"message": "Already seen", "read_count": blog.read_count, "id": blog_id}
@@ -256,10 +508,13 @@ def mark_blog_seen(
     )
     blog.read_count += 1
     db.add(new_interaction)
+    record_engagement(db, blog_id, reads=1)
+    if blog.is_published:
+        bump_author_stats(db, blog.author_id, total_reads=1)
 
     db.commit()
-    db.refresh(blog)
-    db.refresh(new_interaction)
+    interaction_cache.record(current_user.id, blog_id, InteractionState(seen=True))
+    hub.publish(blog_id, counts={"read_count": blog.read_count}, reads=1)
 
     return {"message": "Marked as seen", "read_count": blog.read_count, "id": blog_id}
 
@@ -280,6 +535,8 @@ def like_blog(blog_id: int, db: Session = Depends(get_db), current_user: User =
         interaction = BlogInteraction(user_id=current_user.id, blog_id=blog.id, seen=True)
         db.add(interaction)
 
+    likes, unlikes = blog.likes, blog.unlikes
+
     if not interaction.liked:
         if interaction.unliked:
             blog.unlikes -= 1
@@ -291,10 +548,20 @@ def like_blog(blog_id: int, db: Session = Depends(get_db), current_user: User =
         interaction.liked = False
         blog.likes -= 1
 
+    record_engagement(db, blog.id, likes=blog.likes - likes, unlikes=blog.unlikes - unlikes)
+    if blog.is_published:
+        bump_author_stats(db, blog.author_id, total_likes=blog.likes - likes, total_unlikes=blog.unlikes - unlikes)
 
     db.commit()
-    db.refresh(blog)
-    db.refresh(interaction)
+    interaction_cache.record(
+        current_user.id, blog.id, InteractionState(interaction.seen, interaction.liked, interaction.unliked)
+    )
+    hub.publish(
+        blog.id,
+        counts={"likes": blog.likes, "unlikes": blog.unlikes},
+        likes=blog.likes - likes,
+        unlikes=blog.unlikes - unlikes,
+    )
 
     blog_out = BlogOut.model_validate(blog, from_attributes=True)
     blog_out.interaction = InteractionOut.model_validate(interaction, from_attributes=True)
@@ -319,6 +586,8 @@ def unlike_blog(blog_id: int, db: Session = Depends(get_db), current_user: User
         interaction = BlogInteraction(user_id=current_user.id, blog_id=blog.id, seen=True)
         db.add(interaction)
 
+    likes, unlikes = blog.likes, blog.unlikes
+
     if not interaction.unliked:
         if interaction.liked:
             blog.likes -= 1
@@ -330,10 +599,20 @@ def unlike_blog(blog_id: int, db: Session = Depends(get_db), current_user: User
         interaction.unliked = False
         blog.unlikes -= 1
 
+    record_engagement(db, blog.id, likes=blog.likes - likes, unlikes=blog.unlikes - unlikes)
+    if blog.is_published:
+        bump_author_stats(db, blog.author_id, total_likes=blog.likes - likes, total_unlikes=blog.unlikes - unlikes)
 
     db.commit()
-    db.refresh(blog)
-    db.refresh(interaction)
+    interaction_cache.record(
+        current_user.id, blog.id, InteractionState(interaction.seen, interaction.liked, interaction.unliked)
+    )
+    hub.publish(
+        blog.id,
+        counts={"likes": blog.likes, "unlikes": blog.unlikes},
+        likes=blog.likes - likes,
+        unlikes=blog.unlikes - unlikes,
+    )
 
     blog_out = BlogOut.model_validate(blog, from_attributes=True)
     blog_out.interaction = InteractionOut.model_validate(interaction, from_attributes=True)
@@ -356,8 +635,13 @@ def delete_blog(
     if blog.author_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this blog")
 
-    db.delete(blog)
+    remove_blog(db, blog)
+    bump_author_stats(
+        db, blog.author_id, post_count=-1, **(published_totals(blog, -1) if blog.is_published else {})
+    )
     db.commit()
+    cache.invalidate(cache.BLOGS, [blog.id])
+    cache.invalidate(cache.FEEDS)
 
     return BlogOut.model_validate(blog, from_attributes=True)
 
@@ -382,8 +666,10 @@ def toggle_blog_publish_status(
         )
 
     blog.is_published = not blog.is_published
+    bump_author_stats(db, blog.author_id, **published_totals(blog, 1 if blog.is_published else -1))
     db.commit()
-    db.refresh(blog)
+    cache.invalidate(cache.BLOGS, [blog.id])
+    cache.invalidate(cache.FEEDS)
 
     return {
         "message": "Publish status toggled successfully.",
@@ -397,7 +683,7 @@ def get_blog_comments(
     blog_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
     blog = db.query(Blog).filter(Blog.id == blog_id).first()
@@ -446,8 +732,9 @@ def create_comment(blog_id: int, comment_in: CommentCreate, db: Session = Depend
         is_approved=True,
     )
     db.add(comment)
+    record_engagement(db, blog_id, comments=1)
     db.commit()
-    db.refresh(comment)
+    hub.publish(blog_id, comments=1)
 
     return comment
 
@@ -463,7 +750,6 @@ def toggle_comment_approval(comment_id: int, db: Session = Depends(get_db), curr
 
     comment.is_approved = not comment.is_approved
     db.commit()
-    db.refresh(comment)
     
     return comment
 
@@ -487,7 +773,6 @@ def update_comment(
         setattr(comment, key, value)
 
     db.commit()
-    db.refresh(comment)
     return comment
 
 
@@ -505,5 +790,7 @@ def delete_comment(
         raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
 
     db.delete(comment)
+    record_engagement(db, comment.blog_id, comments=-1)
     db.commit()
+    hub.publish(comment.blog_id, comments=-1)
     return comment
\ No newline at end of file
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.core.security import get_optional_user
+from app.crud.author_stats import get_author_stats
+from app.db.session import get_read_db
+from app.models.user import User
+from app.schemas.user import AuthorStatsOut
+
+router = APIRouter()
+
+
+@router.get("/{user_id}/stats", response_model=AuthorStatsOut)
+def get_user_stats(
+    user_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: Optional[User] = Depends(get_optional_user),
+):
+    stats = get_author_stats(db, user_id)
+    if stats is None:
+        if not db.query(User.id).filter(User.id == user_id).first():
+            raise HTTPException(status_code=404, detail="User not found")
+        return AuthorStatsOut(user_id=user_id)
+
+    stats_out = AuthorStatsOut.model_validate(stats, from_attributes=True)
+    # Unpublished posts only count for the author themselves and superusers.
+    if not current_user or (current_user.id != user_id and not current_user.is_superuser):
+        stats_out.post_count = stats_out.published_count
+    return stats_out
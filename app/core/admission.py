@@ -0,0 +1,144 @@
+"""Per-class concurrency limits with a bounded, deadline-limited wait queue.
+
+Sync route handlers all share AnyIO's threadpool, so a burst of slow requests
+(bcrypt logins, writes) used to queue invisibly in front of everything else.
+The middleware sorts each request into a class, lets at most ``limit`` of a
+class run at once and parks the rest in FIFO order. A request that finds the
+queue full, or is still waiting at the deadline, gets 503 with Retry-After.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from app.core.config import (
+    ADMISSION_AUTH_LIMIT,
+    ADMISSION_CONTROL,
+    ADMISSION_QUEUE_SIZE,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ADMISSION_READ_LIMIT,
+    ADMISSION_RETRY_AFTER_SECONDS,
+    ADMISSION_WRITE_LIMIT,
+)
+from app.core.metrics import Counter, Histogram, register
+
+AUTH = "auth"
+WRITE = "write"
+READ = "read"
+
+# Endpoints that hash or verify a password.
+AUTH_PATHS = frozenset({"/api/v1/auth/login", "/api/v1/auth/register", "/api/v1/auth/change-password"})
+# Cheap or long-lived endpoints that must never wait behind application traffic.
+EXEMPT_PATHS = frozenset({"/metrics", "/healthz", "/readyz"})
+SAFE_METHODS = frozenset({"GET", "HEAD"})
+
+admission_wait = register(Histogram(
+    "blogbox_admission_queue_seconds", "Time requests waited for an admission slot.", ["route_class"],
+))
+admission_rejected = register(Counter(
+    "blogbox_admission_rejected_total", "Requests shed by admission control.", ("route_class", "reason"),
+))
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """The admission class for a request, or None if it bypasses admission control."""
+    if method == "OPTIONS" or path in EXEMPT_PATHS or path.endswith("/live"):
+        return None
+    if path.rstrip("/") in AUTH_PATHS:
+        return AUTH
+    return READ if method in SAFE_METHODS else WRITE
+
+
+class Gate:
+    """Counts running requests of one class; only touched from the event loop."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            admission_wait.observe(0.0, self.name)
+            return True
+        if len(self._waiters) >= self.queue_size:
+            admission_rejected.inc(self.name, "queue_full")
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            # release() hands its slot straight to the waiter, so active is not bumped here.
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            # On Python 3.12+ wait_for can time out after release() has already
+            # handed over the slot; keep it rather than leak it.
+            if not waiter.done() or waiter.cancelled():
+                admission_rejected.inc(self.name, "timeout")
+                return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+        admission_wait.observe(time.perf_counter() - started, self.name)
+        return True
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, enabled: bool = ADMISSION_CONTROL, retry_after: int = ADMISSION_RETRY_AFTER_SECONDS):
+        self.app = app
+        self.enabled = enabled
+        self.retry_after = retry_after
+        self.gates: Dict[str, Gate] = {
+            name: Gate(name, limit, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT_SECONDS)
+            for name, limit in ((AUTH, ADMISSION_AUTH_LIMIT), (WRITE, ADMISSION_WRITE_LIMIT), (READ, ADMISSION_READ_LIMIT))
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            return await self.app(scope, receive, send)
+
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            return await self.app(scope, receive, send)
+
+        gate = self.gates[name]
+        if not await gate.acquire():
+            return await self.reject(send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+    async def reject(self, send):
+        body = json.dumps({"detail": "Server is busy, please retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,51 @@
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Cache namespaces shared by writers and caches.
+USERS = "users"
+BLOGS = "blogs"
+FEEDS = "feeds"
+INTERACTIONS = "interactions"
+
+Invalidator = Callable[[Optional[List]], None]
+
+_invalidators: Dict[str, List[Invalidator]] = defaultdict(list)
+# Set by the invalidation bus so other workers drop the same keys.
+_publisher: Optional[Callable[[str, Optional[List]], None]] = None
+
+
+def register_invalidator(namespace: str, func: Invalidator):
+    """Register ``func(keys)`` to drop entries from a cache; ``keys`` is None for everything."""
+    _invalidators[namespace].append(func)
+
+
+def set_publisher(func: Optional[Callable[[str, Optional[List]], None]]):
+    global _publisher
+    _publisher = func
+
+
+def invalidate(namespace: str, keys: Optional[Iterable] = None, local: bool = True):
+    """Drop cached entries after a committed write, in this and every other worker.
+
+    Call it after ``db.commit()``. Pass ``local=False`` when this worker has
+    already updated its own cache in place.
+    """
+    keys = list(keys) if keys is not None else None
+    if keys is not None and not keys:
+        return
+    if local:
+        invalidate_local(namespace, keys)
+    if _publisher is not None:
+        _publisher(namespace, keys)
+
+
+def invalidate_local(namespace: str, keys: Optional[List] = None):
+    """Drop entries in this process only; used for messages from other workers."""
+    for func in _invalidators.get(namespace, []):
+        func(keys)
+
+
+def invalidate_all_local():
+    """Drop everything in this process, e.g. after missing bus messages."""
+    for namespace in list(_invalidators):
+        invalidate_local(namespace)
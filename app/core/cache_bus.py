@@ -0,0 +1,265 @@
+"""Broadcasts cache invalidations to every worker process.
+
+``cache.invalidate`` drops keys locally and hands them to the running bus,
+which delivers them to the other workers where ``cache.invalidate_local``
+drops them too. Messages carry the sender's id so a worker ignores its own.
+"""
+import json
+import logging
+import os
+import select
+import socket
+import threading
+import uuid
+from collections import deque
+from typing import Deque, List, Optional
+
+from app.core import cache
+from app.core.config import CACHE_BUS_BACKEND, CACHE_BUS_CHANNEL, CACHE_BUS_SOCKET_DIR
+from app.core.metrics import Counter, register
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads must stay under 8000 bytes; past that we drop the whole namespace.
+MAX_NOTIFY_PAYLOAD = 7900
+MAX_DATAGRAM_PAYLOAD = 60000
+
+bus_messages = register(Counter(
+    "blogbox_cache_bus_messages_total", "Cache invalidation messages by direction.", ("backend", "direction")
+))
+
+
+class InvalidationBus:
+    name = "local"
+    max_payload: Optional[int] = None
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name=f"cache-bus-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def publish(self, namespace: str, keys: Optional[List]):
+        payload = self.encode(namespace, keys)
+        if self.max_payload is not None and len(payload) > self.max_payload:
+            payload = self.encode(namespace, None)
+        try:
+            self.send(payload)
+            bus_messages.inc(self.name, "out")
+        except Exception:
+            # The write is already committed; failing the request would not undo it.
+            logger.exception("Could not publish cache invalidation for %s", namespace)
+
+    def encode(self, namespace: str, keys: Optional[List]) -> str:
+        return json.dumps({"origin": self.origin, "namespace": namespace, "keys": keys}, separators=(",", ":"))
+
+    def receive(self, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation message")
+            return
+        if message.get("origin") == self.origin:
+            return
+        bus_messages.inc(self.name, "in")
+        cache.invalidate_local(message["namespace"], message.get("keys"))
+
+    def send(self, payload: str):
+        pass
+
+    def _listen(self):
+        pass
+
+
+class PostgresBus(InvalidationBus):
+    """LISTEN/NOTIFY on a dedicated connection outside the pool.
+
+    Publishing only queues the payload and wakes the bus thread, which sends it
+    on its own connection; request threads never check out a connection or
+    wait on a round trip for it. Payloads stay queued until a NOTIFY succeeds,
+    so a dropped connection delays messages instead of losing them.
+    """
+
+    name = "postgres"
+    max_payload = MAX_NOTIFY_PAYLOAD
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+        self._outbox: Deque[str] = deque()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+
+    def send(self, payload: str):
+        self._outbox.append(payload)
+        self._wake()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake()
+        super().stop(timeout)
+
+    def _wake(self):
+        try:
+            self._wakeup_w.send(b"\0")
+        except BlockingIOError:
+            # Already full of wakeups; the thread will run anyway.
+            pass
+
+    def _drain_wakeups(self):
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _connect(self):
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        connection = self.engine.dialect.connect(*cargs, **cparams)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{CACHE_BUS_CHANNEL}"')
+        return connection
+
+    def _flush(self, connection):
+        with connection.cursor() as cursor:
+            while self._outbox:
+                cursor.execute("SELECT pg_notify(%s, %s)", (CACHE_BUS_CHANNEL, self._outbox[0]))
+                self._outbox.popleft()
+
+    def _listen(self):
+        connection = None
+        while not self._stop.is_set():
+            try:
+                if connection is None:
+                    connection = self._connect()
+                    # Anything sent while we were not listening is lost, so start clean.
+                    cache.invalidate_all_local()
+                self._flush(connection)
+                readable = select.select([connection, self._wakeup_r], [], [], 1.0)[0]
+                if self._wakeup_r in readable:
+                    self._drain_wakeups()
+                if connection in readable:
+                    connection.poll()
+                    while connection.notifies:
+                        self.receive(connection.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Cache bus connection lost; reconnecting")
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+                connection = None
+                self._stop.wait(1.0)
+        if connection is not None:
+            try:
+                self._flush(connection)
+            except Exception:
+                logger.warning("Dropping %d unsent cache invalidations on shutdown", len(self._outbox))
+            connection.close()
+
+
+class UnixSocketBus(InvalidationBus):
+    """One datagram socket per worker in a shared directory, for single-host deployments."""
+
+    name = "unix"
+    max_payload = MAX_DATAGRAM_PAYLOAD
+
+    def __init__(self, directory: str = CACHE_BUS_SOCKET_DIR):
+        super().__init__()
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}-{self.origin[:8]}.sock")
+        self._socket: socket.socket | None = None
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.path)
+        self._socket.settimeout(1.0)
+        super().start()
+
+    def stop(self, timeout: float = 5.0):
+        super().stop(timeout)
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def send(self, payload: str):
+        data = payload.encode()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".sock") or entry.path == self.path:
+                    continue
+                try:
+                    sender.sendto(data, entry.path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Left behind by a worker that died without cleaning up.
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                data = self._socket.recv(MAX_DATAGRAM_PAYLOAD + 1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._stop.is_set():
+                    return
+                raise
+            self.receive(data.decode())
+
+
+_bus: InvalidationBus | None = None
+
+
+def create_bus(backend: str = CACHE_BUS_BACKEND) -> InvalidationBus:
+    from app.db.session import get_engine
+
+    if backend == "auto":
+        backend = "postgres" if get_engine().dialect.name == "postgresql" else "unix"
+    if backend == "postgres":
+        return PostgresBus(get_engine())
+    if backend == "unix":
+        return UnixSocketBus()
+    if backend == "local":
+        return InvalidationBus()
+    raise ValueError(f"Unknown cache bus backend: {backend}")
+
+
+def start(backend: str = CACHE_BUS_BACKEND) -> InvalidationBus:
+    global _bus
+    if _bus is None:
+        _bus = create_bus(backend)
+        if _bus.name != "local":
+            _bus.start()
+            cache.set_publisher(_bus.publish)
+    return _bus
+
+
+def stop():
+    global _bus
+    if _bus is not None:
+        cache.set_publisher(None)
+        _bus.stop()
+        _bus = None
@@ -1,9 +1,10 @@
 import cloudinary
 from app.core import config
 
-cloudinary.config(
-    cloud_name=config.CLOUDINARY_CLOUD_NAME,
-    api_key=config.CLOUDINARY_API_KEY,
-    api_secret=config.CLOUDINARY_API_SECRET,
-    secure=True
-)
+def configure():
+    cloudinary.config(
+        cloud_name=config.CLOUDINARY_CLOUD_NAME,
+        api_key=config.CLOUDINARY_API_KEY,
+        api_secret=config.CLOUDINARY_API_SECRET,
+        secure=True
+    )
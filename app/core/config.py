@@ -10,3 +10,67 @@ REFRESH_TOKEN_EXPIRE_DAYS = 2
 CLOUDINARY_CLOUD_NAME = config("CLOUDINARY_CLOUD_NAME")
 CLOUDINARY_API_KEY = config("CLOUDINARY_API_KEY")
 CLOUDINARY_API_SECRET = config("CLOUDINARY_API_SECRET")
+
+MEDIA_STORAGE_BACKEND = config("MEDIA_STORAGE_BACKEND", default="cloudinary")
+MEDIA_OUTBOX_BATCH_SIZE = config("MEDIA_OUTBOX_BATCH_SIZE", default=100, cast=int)
+MEDIA_OUTBOX_MAX_ATTEMPTS = config("MEDIA_OUTBOX_MAX_ATTEMPTS", default=8, cast=int)
+MEDIA_OUTBOX_INTERVAL_SECONDS = config("MEDIA_OUTBOX_INTERVAL_SECONDS", default=10, cast=int)
+
+RUN_BACKGROUND_WORKER = config("RUN_BACKGROUND_WORKER", default=True, cast=bool)
+
+MEDIA_GC_BATCH_SIZE = config("MEDIA_GC_BATCH_SIZE", default=500, cast=int)
+MEDIA_GC_MIN_AGE_HOURS = config("MEDIA_GC_MIN_AGE_HOURS", default=24, cast=int)
+
+ENGAGEMENT_ROLLUP_BATCH_SIZE = config("ENGAGEMENT_ROLLUP_BATCH_SIZE", default=5000, cast=int)
+ENGAGEMENT_ROLLUP_INTERVAL_SECONDS = config("ENGAGEMENT_ROLLUP_INTERVAL_SECONDS", default=60, cast=int)
+
+# Statements slower than this are kept in the slow query log; 0 turns it off.
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=0, cast=float)
+SLOW_QUERY_LOG_SIZE = config("SLOW_QUERY_LOG_SIZE", default=100, cast=int)
+SLOW_QUERY_EXPLAIN = config("SLOW_QUERY_EXPLAIN", default=True, cast=bool)
+
+# Schema is managed by Alembic; this only exists for throwaway local databases.
+AUTO_CREATE_SCHEMA = config("AUTO_CREATE_SCHEMA", default=False, cast=bool)
+
+# Cross-worker cache invalidation: "auto" (postgres on Postgres, unix otherwise),
+# "postgres" (LISTEN/NOTIFY), "unix" (datagram sockets, single host) or "local".
+CACHE_BUS_BACKEND = config("CACHE_BUS_BACKEND", default="auto")
+CACHE_BUS_CHANNEL = config("CACHE_BUS_CHANNEL", default="cache_invalidation")
+CACHE_BUS_SOCKET_DIR = config("CACHE_BUS_SOCKET_DIR", default="/tmp/blogbox-cache-bus")
+
+# Bounds for the in-memory per-user seen/liked/unliked cache used to annotate feeds.
+INTERACTION_CACHE_MAX_USERS = config("INTERACTION_CACHE_MAX_USERS", default=10000, cast=int)
+INTERACTION_CACHE_MAX_BYTES = config("INTERACTION_CACHE_MAX_BYTES", default=64 * 1024 * 1024, cast=int)
+
+# Authenticated users are cached by token subject so most requests skip the
+# users lookup; entries are dropped on writes and expire after the TTL anyway.
+USER_CACHE_MAX_USERS = config("USER_CACHE_MAX_USERS", default=10000, cast=int)
+USER_CACHE_TTL_SECONDS = config("USER_CACHE_TTL_SECONDS", default=60, cast=float)
+
+AUTHOR_STATS_REPAIR_INTERVAL_SECONDS = config("AUTHOR_STATS_REPAIR_INTERVAL_SECONDS", default=24 * 60 * 60, cast=int)
+
+# /blogs/changes never moves its token past changes younger than this, so
+# slower transactions that took an earlier change_seq are not skipped.
+CHANGES_SETTLE_SECONDS = config("CHANGES_SETTLE_SECONDS", default=5, cast=float)
+
+# Server-sent counter streams: idle streams send a heartbeat this often, and
+# changes arriving within the coalesce window go out as one event per blog.
+LIVE_HEARTBEAT_SECONDS = config("LIVE_HEARTBEAT_SECONDS", default=15, cast=float)
+LIVE_COALESCE_SECONDS = config("LIVE_COALESCE_SECONDS", default=0.5, cast=float)
+
+# Blogs and users with more child rows than this are soft-deleted and purged in
+# the background in batches; smaller ones are deleted at once by ON DELETE CASCADE.
+PURGE_THRESHOLD = config("PURGE_THRESHOLD", default=1000, cast=int)
+PURGE_BATCH_SIZE = config("PURGE_BATCH_SIZE", default=1000, cast=int)
+PURGE_INTERVAL_SECONDS = config("PURGE_INTERVAL_SECONDS", default=30, cast=int)
+
+# Admission control: requests beyond a class's limit wait in a bounded queue
+# and get 503 with Retry-After if no slot frees up in time. The limits together
+# should not exceed the threadpool (40 threads by default).
+ADMISSION_CONTROL = config("ADMISSION_CONTROL", default=True, cast=bool)
+ADMISSION_AUTH_LIMIT = config("ADMISSION_AUTH_LIMIT", default=4, cast=int)
+ADMISSION_WRITE_LIMIT = config("ADMISSION_WRITE_LIMIT", default=12, cast=int)
+ADMISSION_READ_LIMIT = config("ADMISSION_READ_LIMIT", default=24, cast=int)
+ADMISSION_QUEUE_SIZE = config("ADMISSION_QUEUE_SIZE", default=100, cast=int)
+ADMISSION_QUEUE_TIMEOUT_SECONDS = config("ADMISSION_QUEUE_TIMEOUT_SECONDS", default=5, cast=float)
+ADMISSION_RETRY_AFTER_SECONDS = config("ADMISSION_RETRY_AFTER_SECONDS", default=1, cast=int)
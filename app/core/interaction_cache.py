@@ -0,0 +1,177 @@
+"""Per-user seen/liked/unliked blog ids, kept in memory for annotating feeds.
+
+Each cached user holds three sorted ``array('I')`` sets of blog ids, loaded
+with one query the first time the user is needed. Writes update the cached
+sets after commit and tell the other workers to drop the user. Users are
+evicted least recently used first once either bound is exceeded.
+"""
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core import cache
+from app.core.config import INTERACTION_CACHE_MAX_BYTES, INTERACTION_CACHE_MAX_USERS
+from app.core.metrics import Gauge, register
+from app.db.session import get_engine
+from app.models.blog_interaction import LIKED, SEEN, UNLIKED, BlogInteraction
+
+
+class InteractionState(NamedTuple):
+    seen: bool = False
+    liked: bool = False
+    unliked: bool = False
+
+
+NO_INTERACTION = InteractionState()
+
+
+def _contains(ids: array, blog_id: int) -> bool:
+    index = bisect_left(ids, blog_id)
+    return index < len(ids) and ids[index] == blog_id
+
+
+def _set(ids: array, blog_id: int, present: bool):
+    index = bisect_left(ids, blog_id)
+    found = index < len(ids) and ids[index] == blog_id
+    if present and not found:
+        ids.insert(index, blog_id)
+    elif found and not present:
+        del ids[index]
+
+
+class UserInteractions:
+    __slots__ = ("seen", "liked", "unliked")
+
+    def __init__(self, seen: Iterable[int] = (), liked: Iterable[int] = (), unliked: Iterable[int] = ()):
+        self.seen = array("I", sorted(seen))
+        self.liked = array("I", sorted(liked))
+        self.unliked = array("I", sorted(unliked))
+
+    def get(self, blog_id: int) -> InteractionState:
+        return InteractionState(
+            _contains(self.seen, blog_id),
+            _contains(self.liked, blog_id),
+            _contains(self.unliked, blog_id),
+        )
+
+    def put(self, blog_id: int, state: InteractionState):
+        _set(self.seen, blog_id, state.seen)
+        _set(self.liked, blog_id, state.liked)
+        _set(self.unliked, blog_id, state.unliked)
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + sum(sys.getsizeof(ids) for ids in (self.seen, self.liked, self.unliked))
+
+
+class InteractionCache:
+    def __init__(self, max_users: int = INTERACTION_CACHE_MAX_USERS, max_bytes: int = INTERACTION_CACHE_MAX_BYTES):
+        self.max_users = max_users
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._users: "OrderedDict[int, UserInteractions]" = OrderedDict()
+        self._sizes: Dict[int, int] = {}
+        # Loads in flight per user, and a per-user generation bumped by every
+        # write meanwhile; a load is only stored if no write happened since it began.
+        self._loading: Dict[int, int] = {}
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._users)
+
+    def lookup(self, db: Session, user_id: int, blog_ids: Iterable[int]) -> Dict[int, InteractionState]:
+        """State for each blog id; loads the user's interactions on a miss."""
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None:
+                self._users.move_to_end(user_id)
+                return {blog_id: entry.get(blog_id) for blog_id in blog_ids}
+            generation = self._generations.get(user_id, 0)
+            self._loading[user_id] = self._loading.get(user_id, 0) + 1
+
+        try:
+            entry = self._load(db, user_id)
+        except Exception:
+            with self._lock:
+                self._finish_load(user_id)
+            raise
+
+        with self._lock:
+            if self._generations.get(user_id, 0) == generation:
+                self._store(user_id, entry)
+            self._finish_load(user_id)
+        return {blog_id: entry.get(blog_id) for blog_id in blog_ids}
+
+    def record(self, user_id: int, blog_id: int, state: InteractionState):
+        """Apply a committed interaction change here and drop the user in other workers."""
+        with self._lock:
+            self._invalidate_loads(user_id)
+            entry = self._users.get(user_id)
+            if entry is not None:
+                entry.put(blog_id, state)
+                self._resize(user_id, entry)
+                self._evict()
+        cache.invalidate(cache.INTERACTIONS, [user_id], local=False)
+
+    def drop(self, user_ids: Optional[Iterable[int]] = None):
+        with self._lock:
+            targets = list(self._users) + list(self._loading) if user_ids is None else list(user_ids)
+            for user_id in targets:
+                self._invalidate_loads(user_id)
+                if self._users.pop(user_id, None) is not None:
+                    self.nbytes -= self._sizes.pop(user_id)
+
+    def _invalidate_loads(self, user_id: int):
+        if user_id in self._loading:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def _finish_load(self, user_id: int):
+        self._loading[user_id] -= 1
+        if not self._loading[user_id]:
+            del self._loading[user_id]
+            self._generations.pop(user_id, None)
+
+    def _load(self, db: Session, user_id: int) -> UserInteractions:
+        # Always from the primary: entries live until the next write or eviction,
+        # so a copy from a lagging replica could hide a like indefinitely.
+        rows = db.execute(
+            select(BlogInteraction.blog_id, BlogInteraction.flags)
+            .where(BlogInteraction.user_id == user_id, BlogInteraction.flags != 0),
+            bind_arguments={"bind": get_engine()},
+        ).all()
+        return UserInteractions(
+            seen=(row.blog_id for row in rows if row.flags & SEEN),
+            liked=(row.blog_id for row in rows if row.flags & LIKED),
+            unliked=(row.blog_id for row in rows if row.flags & UNLIKED),
+        )
+
+    def _store(self, user_id: int, entry: UserInteractions):
+        if user_id in self._users:
+            self.nbytes -= self._sizes.pop(user_id)
+        self._users[user_id] = entry
+        self._resize(user_id, entry)
+        self._evict()
+
+    def _resize(self, user_id: int, entry: UserInteractions):
+        size = entry.nbytes()
+        self.nbytes += size - self._sizes.get(user_id, 0)
+        self._sizes[user_id] = size
+
+    def _evict(self):
+        while self._users and (len(self._users) > self.max_users or self.nbytes > self.max_bytes):
+            user_id, _ = self._users.popitem(last=False)
+            self.nbytes -= self._sizes.pop(user_id)
+
+
+interaction_cache = InteractionCache()
+
+cache.register_invalidator(cache.INTERACTIONS, interaction_cache.drop)
+
+register(Gauge("blogbox_interaction_cache_users", "Users held in the interaction cache.", lambda: len(interaction_cache)))
+register(Gauge("blogbox_interaction_cache_bytes", "Approximate memory used by the interaction cache.", lambda: interaction_cache.nbytes))
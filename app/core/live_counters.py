@@ -0,0 +1,119 @@
+"""In-process pub/sub of blog counter changes for the server-sent events endpoints.
+
+Write paths call ``publish`` after commit, from whatever thread they run in;
+delivery happens on the event loop. Each subscriber keeps one merged delta
+per blog rather than a queue, so a slow client costs at most one small dict
+per watched blog and an idle one costs a parked coroutine.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+from app.core.config import LIVE_COALESCE_SECONDS, LIVE_HEARTBEAT_SECONDS
+from app.core.metrics import Gauge, register
+
+
+class Subscriber:
+    __slots__ = ("blog_ids", "pending", "wakeup", "closed")
+
+    def __init__(self, blog_ids: Iterable[int]):
+        self.blog_ids = frozenset(blog_ids)
+        self.pending: Dict[int, dict] = {}
+        self.wakeup = asyncio.Event()
+        self.closed = False
+
+    def push(self, blog_id: int, deltas: Dict[str, int], counts: Optional[Dict[str, int]]):
+        entry = self.pending.setdefault(blog_id, {"blog_id": blog_id, "delta": {}, "counts": {}})
+        for name, value in deltas.items():
+            entry["delta"][name] = entry["delta"].get(name, 0) + value
+        if counts:
+            entry["counts"].update(counts)
+        self.wakeup.set()
+
+    def drain(self) -> Dict[int, dict]:
+        pending, self.pending = self.pending, {}
+        self.wakeup.clear()
+        return pending
+
+
+class CounterHub:
+    def __init__(self):
+        self._subscribers: Dict[int, Set[Subscriber]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.connections = 0
+
+    def subscribe(self, blog_ids: Iterable[int]) -> Subscriber:
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(blog_ids)
+        with self._lock:
+            for blog_id in subscriber.blog_ids:
+                self._subscribers[blog_id].add(subscriber)
+            self.connections += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            for blog_id in subscriber.blog_ids:
+                watchers = self._subscribers.get(blog_id)
+                if watchers is not None:
+                    watchers.discard(subscriber)
+                    if not watchers:
+                        del self._subscribers[blog_id]
+            self.connections -= 1
+
+    def publish(self, blog_id: int, counts: Optional[Dict[str, int]] = None, **deltas: int):
+        """Announce a committed counter change; safe to call from worker threads."""
+        deltas = {name: value for name, value in deltas.items() if value}
+        if not deltas or blog_id not in self._subscribers or self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, blog_id, deltas, counts)
+        except RuntimeError:
+            # The loop has been closed; nobody is listening any more.
+            pass
+
+    def _deliver(self, blog_id: int, deltas: Dict[str, int], counts: Optional[Dict[str, int]]):
+        with self._lock:
+            watchers = list(self._subscribers.get(blog_id, ()))
+        for subscriber in watchers:
+            subscriber.push(blog_id, deltas, counts)
+
+    def close(self):
+        """Wake every stream so it ends; used on shutdown."""
+        with self._lock:
+            subscribers = {subscriber for watchers in self._subscribers.values() for subscriber in watchers}
+        for subscriber in subscribers:
+            subscriber.closed = True
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(subscriber.wakeup.set)
+
+    async def stream(self, blog_ids: Iterable[int]) -> AsyncIterator[str]:
+        """SSE body: one ``counters`` event per changed blog, heartbeats while idle."""
+        subscriber = self.subscribe(blog_ids)
+        try:
+            yield f"retry: {int(LIVE_HEARTBEAT_SECONDS * 1000)}\n\n"
+            while not subscriber.closed:
+                try:
+                    await asyncio.wait_for(subscriber.wakeup.wait(), LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if subscriber.closed:
+                    break
+                # Let a burst of likes collapse into one event per blog.
+                await asyncio.sleep(LIVE_COALESCE_SECONDS)
+                for entry in subscriber.drain().values():
+                    entry["delta"] = {name: value for name, value in entry["delta"].items() if value}
+                    if not entry["delta"] and not entry["counts"]:
+                        continue
+                    yield f"event: counters\ndata: {json.dumps(entry, separators=(',', ':'))}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+
+hub = CounterHub()
+
+register(Gauge("blogbox_live_counter_connections", "Open server-sent event streams for blog counters.", lambda: hub.connections))
@@ -0,0 +1,214 @@
+"""In-process request and database metrics rendered in Prometheus text format."""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+        for label_values, counts, total, count in sorted(snapshot):
+            labels = _format_labels(self.labels, label_values)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{bound:g}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {count}'
+            yield f"{self.name}_sum{{{labels}}} {total:.6f}"
+            yield f"{self.name}_count{{{labels}}} {count}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for label_values, value in snapshot:
+            yield f"{self.name}{{{_format_labels(self.labels, label_values)}}} {value:g}"
+
+
+class Gauge:
+    def __init__(self, name: str, help: str, func):
+        self.name = name
+        self.help = help
+        self.func = func
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {self.func():g}"
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+
+
+REGISTRY: list = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+request_duration = register(Histogram(
+    "blogbox_http_request_duration_seconds", "Request latency by route template.", ["method", "route", "status"],
+))
+request_db_time = register(Histogram(
+    "blogbox_http_request_db_seconds", "Time spent executing SQL per request.", ["method", "route"],
+))
+request_statements = register(Histogram(
+    "blogbox_http_request_sql_statements", "SQL statements executed per request.", ["method", "route"], COUNT_BUCKETS,
+))
+request_pool_wait = register(Histogram(
+    "blogbox_http_request_pool_wait_seconds", "Time spent waiting for a pooled connection per request.", ["method", "route"],
+))
+request_connections = register(Histogram(
+    "blogbox_http_request_db_connections", "Pooled connections checked out per request.", ["method", "route"], COUNT_BUCKETS,
+))
+
+
+class RequestStats:
+    __slots__ = ("scope", "statements", "db_time", "pool_wait", "connections")
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.connections = 0
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route in the scope; label by its
+        # template, never by raw path, to keep cardinality bounded.
+        route = self.scope.get("route") if self.scope else None
+        return getattr(route, "path", None) or "unmatched"
+
+
+# Set by MetricsMiddleware; sync endpoints run in a worker thread with a copy
+# of the context, so they update the same RequestStats object.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route_name = stats.route
+            method = scope["method"]
+            request_duration.observe(elapsed, method, route_name, str(status_code))
+            request_db_time.observe(stats.db_time, method, route_name)
+            request_statements.observe(stats.statements, method, route_name)
+            request_pool_wait.observe(stats.pool_wait, method, route_name)
+            request_connections.observe(stats.connections, method, route_name)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that charges checkouts and the time spent waiting for them to the current request."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats = current_request.get()
+            if stats is not None:
+                stats.pool_wait += time.perf_counter() - started
+                stats.connections += 1
@@ -9,6 +9,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session  
 from app.db.session import get_db
 from app.models.user import User
+from app.core.user_cache import user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -50,7 +51,7 @@ def get_optional_user(
     except JWTError:
         return None
 
-    return db.query(User).filter(User.email == email).first()
+    return user_cache.lookup(db, email)
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     credentials_exception = HTTPException(
@@ -67,7 +68,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    user = user_cache.lookup(db, email)
     if user is None:
         raise credentials_exception
 
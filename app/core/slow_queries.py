@@ -0,0 +1,119 @@
+"""Opt-in log of slow SQL statements, kept in a bounded in-memory ring buffer."""
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import SLOW_QUERY_EXPLAIN, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_MS
+from app.core.metrics import current_request
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists differ in length per call; fold them so equal queries group together.
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\?|:\w+)(?:\s*,\s*(?:%\(\w+\)s|\?|:\w+))+\s*\)")
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+
+_entries: deque = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_lock = threading.Lock()
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("(...)", statement)
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: _redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact(value) for value in parameters]
+    return _redact(parameters)
+
+
+def _redact(value) -> str:
+    return "NULL" if value is None else f"<{type(value).__name__}>"
+
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    # Use the raw DBAPI cursor so the EXPLAIN bypasses the engine events, and a
+    # savepoint so a failing EXPLAIN can't abort the request's transaction.
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute("EXPLAIN (ANALYZE off) " + statement, parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as exc:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"EXPLAIN failed: {exc}"
+    except Exception:
+        logger.debug("Could not capture plan for slow query", exc_info=True)
+        return None
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+
+    plan = None
+    if (
+        SLOW_QUERY_EXPLAIN
+        and not executemany
+        and conn.dialect.name == "postgresql"
+        and statement.lstrip().lower().startswith(_EXPLAINABLE)
+    ):
+        plan = _explain(conn, statement, parameters)
+
+    stats = current_request.get()
+    entry = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round(elapsed_ms, 3),
+        "statement": normalize_statement(statement),
+        "parameters": redact_parameters(parameters, executemany),
+        "route": stats.route if stats is not None else None,
+        "plan": plan,
+    }
+    with _lock:
+        _entries.append(entry)
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("slow_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    if SLOW_QUERY_MS <= 0:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def get_slow_queries() -> List[dict]:
+    """Recorded slow statements, newest first."""
+    with _lock:
+        return list(reversed(_entries))
+
+
+def clear_slow_queries():
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,121 @@
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import cloudinary.api
+
+# Cloudinary rejects bulk deletes with more ids than this.
+CLOUDINARY_DELETE_LIMIT = 100
+CLOUDINARY_LIST_PAGE_SIZE = 500
+
+_VERSION_SEGMENT = re.compile(r"^v\d+$")
+_TRANSFORMATION_SEGMENT = re.compile(r"^[a-z]{1,3}_[^/]*$")
+
+
+def public_id_from_url(url: Optional[str]) -> Optional[str]:
+    """Extract the public id from a Cloudinary delivery URL, or None for other URLs."""
+    if not url:
+        return None
+
+    parsed = urlparse(url)
+    if not parsed.netloc.endswith("cloudinary.com") or "/upload/" not in parsed.path:
+        return None
+
+    segments = parsed.path.split("/upload/", 1)[1].split("/")
+    versions = [i for i, segment in enumerate(segments) if _VERSION_SEGMENT.match(segment)]
+    if versions:
+        segments = segments[versions[0] + 1:]
+    else:
+        while len(segments) > 1 and _TRANSFORMATION_SEGMENT.match(segments[0]):
+            segments = segments[1:]
+
+    public_id = "/".join(segments)
+    if "." in segments[-1]:
+        public_id = public_id.rsplit(".", 1)[0]
+    return public_id or None
+
+
+class MediaStorage(ABC):
+    @abstractmethod
+    def delete_many(self, public_ids: List[str]) -> Set[str]:
+        """Delete assets and return the ids that no longer exist remotely."""
+
+    @abstractmethod
+    def iter_assets(self) -> Iterator[Tuple[str, datetime]]:
+        """Yield (public_id, created_at) for every stored asset."""
+
+
+class CloudinaryStorage(MediaStorage):
+    def delete_many(self, public_ids: List[str]) -> Set[str]:
+        done = set()
+        for start in range(0, len(public_ids), CLOUDINARY_DELETE_LIMIT):
+            chunk = public_ids[start:start + CLOUDINARY_DELETE_LIMIT]
+            result = cloudinary.api.delete_resources(chunk)
+            for public_id, outcome in result.get("deleted", {}).items():
+                if outcome in ("deleted", "not_found"):
+                    done.add(public_id)
+        return done
+
+    def iter_assets(self) -> Iterator[Tuple[str, datetime]]:
+        next_cursor = None
+        while True:
+            options = {"type": "upload", "max_results": CLOUDINARY_LIST_PAGE_SIZE}
+            if next_cursor:
+                options["next_cursor"] = next_cursor
+            page = cloudinary.api.resources(**options)
+            for resource in page.get("resources", []):
+                created_at = datetime.fromisoformat(resource["created_at"].replace("Z", "+00:00"))
+                yield resource["public_id"], created_at
+
+            next_cursor = page.get("next_cursor")
+            if not next_cursor:
+                return
+
+
+class FakeStorage(MediaStorage):
+    """In-memory storage for local runs and tests."""
+
+    def __init__(self, public_ids: Iterable[str] = ()):
+        self.assets: Dict[str, datetime] = {}
+        self.delete_calls: List[List[str]] = []
+        self.fail_next = 0
+        for public_id in public_ids:
+            self.add(public_id)
+
+    def add(self, public_id: str, created_at: Optional[datetime] = None):
+        self.assets[public_id] = created_at or datetime.now(timezone.utc)
+
+    def delete_many(self, public_ids: List[str]) -> Set[str]:
+        self.delete_calls.append(list(public_ids))
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError("Fake storage failure")
+
+        for public_id in public_ids:
+            self.assets.pop(public_id, None)
+        return set(public_ids)
+
+    def iter_assets(self) -> Iterator[Tuple[str, datetime]]:
+        yield from list(self.assets.items())
+
+
+_storage: MediaStorage | None = None
+
+
+def get_storage() -> MediaStorage:
+    global _storage
+    if _storage is None:
+        from app.core.config import MEDIA_STORAGE_BACKEND
+
+        if MEDIA_STORAGE_BACKEND == "fake":
+            _storage = FakeStorage()
+        else:
+            _storage = CloudinaryStorage()
+    return _storage
+
+
+def set_storage(storage: MediaStorage) -> None:
+    global _storage
+    _storage = storage
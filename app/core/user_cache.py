@@ -0,0 +1,100 @@
+"""Authenticated users kept in memory so a cache hit needs no database connection.
+
+Entries are detached copies of the users row keyed by email, the subject of
+our tokens. ``lookup`` merges the copy into the request's session without
+loading it, so handlers get an ordinary persistent ``User`` and the session
+only checks out a connection if the handler itself queries. Writes to users
+drop entries through the USERS cache namespace; the TTL bounds anything missed.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core import cache
+from app.core.config import USER_CACHE_MAX_USERS, USER_CACHE_TTL_SECONDS
+from app.core.metrics import Counter, Gauge, register
+from app.models.user import User
+
+user_cache_lookups = register(Counter("blogbox_user_cache_lookups_total", "Authenticated user lookups by result.", ("result",)))
+
+
+class CachedUser(NamedTuple):
+    user: User
+    expires_at: float
+
+
+def _detached_copy(user: User) -> User:
+    copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
+
+
+class UserCache:
+    def __init__(self, max_users: int = USER_CACHE_MAX_USERS, ttl: float = USER_CACHE_TTL_SECONDS):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._users: "OrderedDict[str, CachedUser]" = OrderedDict()
+        self._emails: Dict[int, str] = {}
+        # Bumped by every drop; a load that overlapped one is not stored.
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._users)
+
+    def lookup(self, db: Session, email: str) -> Optional[User]:
+        """The user with ``email``, attached to ``db``; queries only on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._users.get(email)
+            if entry is not None and entry.expires_at > now:
+                self._users.move_to_end(email)
+                hit = entry.user
+            else:
+                hit = None
+            generation = self._generation
+
+        if hit is not None:
+            user_cache_lookups.inc("hit")
+            return db.merge(hit, load=False)
+
+        user_cache_lookups.inc("miss")
+        user = db.query(User).filter(User.email == email).first()
+        if user is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._store(email, CachedUser(_detached_copy(user), now + self.ttl))
+        return user
+
+    def drop(self, user_ids: Optional[Iterable[int]] = None):
+        with self._lock:
+            self._generation += 1
+            if user_ids is None:
+                self._users.clear()
+                self._emails.clear()
+                return
+            for user_id in user_ids:
+                email = self._emails.pop(user_id, None)
+                if email is not None:
+                    self._users.pop(email, None)
+
+    def _store(self, email: str, entry: CachedUser):
+        previous = self._emails.get(entry.user.id)
+        if previous is not None and previous != email:
+            self._users.pop(previous, None)
+        self._users[email] = entry
+        self._users.move_to_end(email)
+        self._emails[entry.user.id] = email
+        while len(self._users) > self.max_users:
+            _, evicted = self._users.popitem(last=False)
+            self._emails.pop(evicted.user.id, None)
+
+
+user_cache = UserCache()
+
+cache.register_invalidator(cache.USERS, user_cache.drop)
+
+register(Gauge("blogbox_user_cache_users", "Users held in the authenticated user cache.", lambda: len(user_cache)))
@@ -0,0 +1,43 @@
+from datetime import date
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.models.analytics import BlogDailyStats, EngagementEvent
+from app.models.blog import Blog
+
+METRICS = ("reads", "likes", "unlikes", "comments")
+
+def record_engagement(db: Session, blog_id: int, reads: int = 0, likes: int = 0, unlikes: int = 0, comments: int = 0):
+    """Append a counter delta; it is committed together with the caller's write."""
+    if reads or likes or unlikes or comments:
+        db.add(EngagementEvent(blog_id=blog_id, reads=reads, likes=likes, unlikes=unlikes, comments=comments))
+
+def get_engagement_series(db: Session, start: date, end: date, blog_id: Optional[int] = None):
+    query = (
+        db.query(
+            BlogDailyStats.day,
+            *(func.sum(getattr(BlogDailyStats, metric)).label(metric) for metric in METRICS),
+        )
+        .filter(BlogDailyStats.day >= start, BlogDailyStats.day <= end)
+    )
+    if blog_id is not None:
+        query = query.filter(BlogDailyStats.blog_id == blog_id)
+    return query.group_by(BlogDailyStats.day).order_by(BlogDailyStats.day).all()
+
+def get_top_blogs(db: Session, start: date, end: date, metric: str = "likes", limit: int = 10):
+    totals = (
+        db.query(
+            BlogDailyStats.blog_id,
+            *(func.sum(getattr(BlogDailyStats, name)).label(name) for name in METRICS),
+        )
+        .filter(BlogDailyStats.day >= start, BlogDailyStats.day <= end)
+        .group_by(BlogDailyStats.blog_id)
+        .subquery()
+    )
+    return (
+        db.query(totals, Blog.title)
+        .outerjoin(Blog, Blog.id == totals.c.blog_id)
+        .order_by(getattr(totals.c, metric).desc(), totals.c.blog_id)
+        .limit(limit)
+        .all()
+    )
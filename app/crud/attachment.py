@@ -1,14 +1,32 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from typing import List
 from app.models import Attachment
-from app.schemas.attachment import AttachmentCreate
+from app.schemas.attachment import AttachmentCreate, AttachmentCreateWithoutBlogId
 
 def create_attachment(db: Session, attachment: AttachmentCreate):
     db_attachment = Attachment(**attachment.dict())
     db.add(db_attachment)
     db.commit()
-    db.refresh(db_attachment)
     return db_attachment
 
+def create_attachments(db: Session, blog_id: int, attachments: List[AttachmentCreateWithoutBlogId]):
+    if not attachments:
+        return []
+
+    # A single multi-row INSERT ... RETURNING; plain rows are returned so
+    # nothing has to be reloaded after the commit.
+    stmt = insert(Attachment).returning(
+        Attachment.id,
+        Attachment.file_url,
+        Attachment.file_public_id,
+        Attachment.blog_id,
+        sort_by_parameter_order=True,
+    )
+    rows = db.execute(stmt, [{**attachment.model_dump(), "blog_id": blog_id} for attachment in attachments]).all()
+    db.commit()
+    return rows
+
 def delete_attachment(db: Session, attachment_id: int):
     db_attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
     if db_attachment:
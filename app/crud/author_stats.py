@@ -0,0 +1,77 @@
+from typing import Iterable, Optional
+from sqlalchemy import case, delete, exists, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.analytics import AuthorStats
+from app.models.blog import Blog
+
+STAT_COLUMNS = ("post_count", "published_count", "total_reads", "total_likes", "total_unlikes")
+
+def _upsert(db: Session):
+    dialect = db.get_bind().dialect.name
+    return (postgresql.insert if dialect == "postgresql" else sqlite.insert)(AuthorStats)
+
+def published_totals(blog: Blog, sign: int = 1) -> dict:
+    """What a published blog contributes to its author's follower-visible totals."""
+    return {
+        "published_count": sign,
+        "total_reads": sign * (blog.read_count or 0),
+        "total_likes": sign * (blog.likes or 0),
+        "total_unlikes": sign * (blog.unlikes or 0),
+    }
+
+def bump_author_stats(db: Session, author_id: int, **deltas: int):
+    """Add counter deltas in one upsert; it is committed together with the caller's write."""
+    deltas = {column: value for column, value in deltas.items() if value}
+    if not deltas:
+        return
+
+    stmt = _upsert(db).values(user_id=author_id, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AuthorStats.user_id],
+        set_={
+            **{column: getattr(AuthorStats, column) + stmt.excluded[column] for column in deltas},
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+def repair_author_stats(db: Session, author_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute author_stats from blogs, set-based; only rows that drifted are rewritten.
+
+    Does not commit. Returns the number of rows inserted or corrected.
+    """
+    published = Blog.is_published == True
+    totals = (
+        select(
+            Blog.author_id,
+            func.count(Blog.id),
+            func.sum(case((published, 1), else_=0)),
+            func.sum(case((published, func.coalesce(Blog.read_count, 0)), else_=0)),
+            func.sum(case((published, func.coalesce(Blog.likes, 0)), else_=0)),
+            func.sum(case((published, func.coalesce(Blog.unlikes, 0)), else_=0)),
+        )
+        # SQLite needs a WHERE before ON CONFLICT in INSERT ... SELECT.
+        .where(Blog.author_id.isnot(None), Blog.deleted_at.is_(None))
+        .group_by(Blog.author_id)
+    )
+    stale = delete(AuthorStats).where(~exists().where(Blog.author_id == AuthorStats.user_id, Blog.deleted_at.is_(None)))
+    if author_ids is not None:
+        author_ids = list(author_ids)
+        if not author_ids:
+            return 0
+        totals = totals.where(Blog.author_id.in_(author_ids))
+        stale = stale.where(AuthorStats.user_id.in_(author_ids))
+
+    stmt = _upsert(db).from_select(["user_id", *STAT_COLUMNS], totals)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AuthorStats.user_id],
+        set_={**{column: stmt.excluded[column] for column in STAT_COLUMNS}, "updated_at": func.now()},
+        where=or_(*(getattr(AuthorStats, column) != stmt.excluded[column] for column in STAT_COLUMNS)),
+    )
+    repaired = db.execute(stmt).rowcount
+    db.execute(stale)
+    return repaired
+
+def get_author_stats(db: Session, user_id: int) -> Optional[AuthorStats]:
+    return db.get(AuthorStats, user_id)
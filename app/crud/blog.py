@@ -1,14 +1,18 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models.blog import Blog
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import desc, func, select, union_all, update
+from app.core.config import PURGE_THRESHOLD
+from app.models.blog import Attachment, Blog, BlogTombstone, Comment, tombstones_for
+from app.models.analytics import EngagementEvent
+from app.models.blog_interaction import BlogInteraction
+from app.crud.author_stats import repair_author_stats
 from app.schemas.blog import BlogCreate, BlogUpdate
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 def create_blog(db: Session, blog: BlogCreate, user_id: int):
     db_blog = Blog(**blog.model_dump(), author_id=user_id)
     db.add(db_blog)
     db.commit()
-    db.refresh(db_blog)
     return db_blog
 
 def get_blog(db: Session, blog_id: int) -> Optional[Blog]:
@@ -32,7 +36,6 @@ def update_blog(db: Session, blog_id: int, blog_update: BlogUpdate, user_id: int
         setattr(blog, key, value)
 
     db.commit()
-    db.refresh(blog)
     return blog
 
 def delete_blog(db: Session, blog_id: int, user_id: int) -> bool:
@@ -40,9 +43,122 @@ def delete_blog(db: Session, blog_id: int, user_id: int) -> bool:
     if not blog:
         return False
 
-    db.delete(blog)
+    remove_blog(db, blog)
     db.commit()
     return True
 
+def exceeds(db: Session, stmt, limit: int) -> bool:
+    """Whether ``stmt`` returns more than ``limit`` rows, reading at most ``limit + 1``."""
+    return db.execute(select(func.count()).select_from(stmt.limit(limit + 1).subquery())).scalar() > limit
+
+def _blog_children(blog_id: int):
+    return union_all(
+        select(Comment.blog_id).where(Comment.blog_id == blog_id),
+        select(BlogInteraction.blog_id).where(BlogInteraction.blog_id == blog_id),
+        select(Attachment.blog_id).where(Attachment.blog_id == blog_id),
+        select(EngagementEvent.blog_id).where(EngagementEvent.blog_id == blog_id),
+    )
+
+def remove_blog(db: Session, blog: Blog) -> bool:
+    """Delete a blog without loading its children; does not commit.
+
+    Small blogs are deleted at once and the database cascades to their rows.
+    Blogs with more than PURGE_THRESHOLD children are only marked deleted and
+    left to the purge job. Returns True when the blog is already gone.
+    """
+    if exceeds(db, _blog_children(blog.id), PURGE_THRESHOLD):
+        db.execute(tombstones_for(Blog.id == blog.id))
+        blog.deleted_at = datetime.now(timezone.utc)
+        return False
+
+    db.delete(blog)
+    return True
+
 def get_blogs_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 10) -> List[Blog]:
     return db.query(Blog).filter(Blog.author_id == user_id).order_by(desc(Blog.created_at)).offset(skip).limit(limit).all()
+
+def set_blogs_published(
+    db: Session,
+    is_published: bool,
+    ids: Optional[List[int]] = None,
+    author_id: Optional[int] = None,
+    current: Optional[bool] = None,
+) -> List[int]:
+    """Set is_published on the selected blogs in one UPDATE; returns the ids that changed.
+
+    The affected authors' stats are recomputed in the same transaction.
+    """
+    conditions = [Blog.is_published != is_published]
+    if ids is not None:
+        conditions.append(Blog.id.in_(ids))
+    if author_id is not None:
+        conditions.append(Blog.author_id == author_id)
+    if current is not None:
+        conditions.append(Blog.is_published == current)
+
+    stmt = (
+        update(Blog)
+        .where(*conditions)
+        .values(is_published=is_published, **({"was_published": True} if is_published else {}))
+        .returning(Blog.id, Blog.author_id)
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.execute(stmt).all()
+    repair_author_stats(db, {row.author_id for row in rows})
+    db.commit()
+    return [row.id for row in rows]
+
+def get_blog_changes(db: Session, since: int, limit: int) -> Tuple[List[Blog], List[BlogTombstone]]:
+    """Blogs and tombstones whose change_seq is past ``since``, oldest first, up to ``limit + 1`` of each."""
+    blogs = (
+        db.query(Blog)
+        .options(joinedload(Blog.author))
+        .filter(Blog.change_seq > since)
+        .order_by(Blog.change_seq)
+        .limit(limit + 1)
+        .all()
+    )
+    tombstones = (
+        db.query(BlogTombstone)
+        .filter(BlogTombstone.change_seq > since)
+        .order_by(BlogTombstone.change_seq)
+        .limit(limit + 1)
+        .all()
+    )
+    return blogs, tombstones
+
+def apply_content_edits(content: str, edits) -> str:
+    """Apply splice edits made against ``content``.
+
+    Each edit replaces ``content[start:end]`` with its text; edits may come in
+    any order but must not overlap. Raises ValueError otherwise.
+    """
+    pieces = []
+    position = 0
+    for edit in sorted(edits, key=lambda edit: (edit.start, edit.end)):
+        if edit.end < edit.start:
+            raise ValueError(f"Edit end {edit.end} is before its start {edit.start}")
+        if edit.start < position:
+            raise ValueError(f"Edit at {edit.start} overlaps the previous edit")
+        if edit.end > len(content):
+            raise ValueError(f"Edit end {edit.end} is past the end of the content ({len(content)})")
+        pieces.append(content[position:edit.start])
+        pieces.append(edit.text)
+        position = edit.end
+    pieces.append(content[position:])
+    return "".join(pieces)
+
+def update_blog_content(db: Session, blog_id: int, base_version: int, content: str):
+    """Store new content only if the blog is still at ``base_version``; does not commit.
+
+    Returns the new (content_version, updated_at) row, or None when another
+    write got there first.
+    """
+    stmt = (
+        update(Blog)
+        .where(Blog.id == blog_id, Blog.content_version == base_version)
+        .values(content=content, content_version=Blog.content_version + 1)
+        .returning(Blog.content_version, Blog.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).first()
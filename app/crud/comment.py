@@ -6,7 +6,6 @@ def create_comment(db: Session, comment: CommentCreate, user_id: int, blog_id: i
     db_comment = Comment(**comment.model_dump(), user_id=user_id, blog_id=blog_id)
     db.add(db_comment)
     db.commit()
-    db.refresh(db_comment)
     return db_comment
 
 def get_comments_by_blog(db: Session, blog_id: int, skip: int = 0, limit: int = 10):
@@ -24,5 +23,4 @@ def approve_comment(db: Session, comment_id: int, is_approved: bool = True):
     if comment:
         comment.is_approved = is_approved
         db.commit()
-        db.refresh(comment)
     return comment
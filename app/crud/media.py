@@ -0,0 +1,9 @@
+from sqlalchemy.orm import Session
+from typing import Iterable
+from app.models.media import MediaDeletion
+
+def enqueue_media_deletions(db: Session, public_ids: Iterable[str]):
+    """Queue remote deletes; they are committed together with the caller's transaction."""
+    for public_id in public_ids:
+        if public_id:
+            db.add(MediaDeletion(public_id=public_id))
@@ -1,11 +1,23 @@
+from datetime import datetime, timezone
+from sqlalchemy import func, or_, select, union_all, update
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from app import models
 from app.schemas.user import UserCreate, UserUpdate
+from app.core import cache
+from app.core.config import PURGE_THRESHOLD
 from app.core.security import get_password_hash, verify_password
+from app.crud.blog import exceeds
 from fastapi import HTTPException
 
 def create_user(db: Session, user: UserCreate):
-    existing_user = db.query(models.user.User).filter(models.user.User.email == user.email).first()
+    # A soft-deleted account still holds its email until the purge job removes it.
+    existing_user = (
+        db.query(models.user.User)
+        .filter(models.user.User.email == user.email)
+        .execution_options(include_deleted=True)
+        .first()
+    )
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
@@ -20,7 +32,6 @@ def create_user(db: Session, user: UserCreate):
     
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 def authenticate_user(db: Session, email: str, password: str):
@@ -38,6 +49,97 @@ def get_user_by_email(db: Session, email: str):
 def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.user.User).offset(skip).limit(limit).all()
 
+def user_filters(is_active: Optional[bool] = None, q: Optional[str] = None) -> list:
+    """Conditions selecting non-superusers, optionally by status and username/email prefix."""
+    User = models.user.User
+    conditions = [User.is_superuser == False]
+    if is_active is not None:
+        conditions.append(User.is_active == is_active)
+    if q:
+        prefix = q.lower()
+        conditions.append(or_(
+            func.lower(User.username).startswith(prefix, autoescape=True),
+            func.lower(User.email).startswith(prefix, autoescape=True),
+        ))
+    return conditions
+
+def set_users_active(
+    db: Session,
+    is_active: bool,
+    ids: Optional[List[int]] = None,
+    current: Optional[bool] = None,
+    q: Optional[str] = None,
+) -> List[int]:
+    """Set is_active on the selected non-superusers in one UPDATE; returns the ids that changed."""
+    User = models.user.User
+    conditions = user_filters(is_active=current, q=q) + [User.is_active != is_active]
+    if ids is not None:
+        conditions.append(User.id.in_(ids))
+
+    stmt = (
+        update(User)
+        .where(*conditions)
+        .values(is_active=is_active)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    changed = db.execute(stmt).scalars().all()
+    db.commit()
+    return changed
+
+def get_users_with_stats(
+    db: Session,
+    cursor: Optional[int] = None,
+    limit: int = 20,
+    is_active: Optional[bool] = None,
+    q: Optional[str] = None,
+):
+    """One page of non-superusers (newest first) with their activity aggregates.
+
+    Returns ``limit + 1`` rows at most so the caller can tell whether another
+    page exists. Aggregates are grouped over the page's user ids only.
+    """
+    User = models.user.User
+    Blog = models.blog.Blog
+    Comment = models.blog.Comment
+
+    page = select(User.id).where(*user_filters(is_active=is_active, q=q))
+    if cursor is not None:
+        page = page.where(User.id < cursor)
+    page = page.order_by(User.id.desc()).limit(limit + 1).subquery()
+    page_ids = select(page.c.id)
+
+    blog_stats = (
+        select(
+            Blog.author_id.label("user_id"),
+            func.count(Blog.id).label("blog_count"),
+            func.sum(Blog.likes).label("total_likes"),
+        )
+        .where(Blog.author_id.in_(page_ids))
+        .group_by(Blog.author_id)
+        .subquery()
+    )
+    comment_stats = (
+        select(Comment.user_id, func.count(Comment.id).label("comment_count"))
+        .where(Comment.user_id.in_(page_ids))
+        .group_by(Comment.user_id)
+        .subquery()
+    )
+
+    return (
+        db.query(
+            User,
+            func.coalesce(blog_stats.c.blog_count, 0),
+            func.coalesce(comment_stats.c.comment_count, 0),
+            func.coalesce(blog_stats.c.total_likes, 0),
+        )
+        .join(page, page.c.id == User.id)
+        .outerjoin(blog_stats, blog_stats.c.user_id == User.id)
+        .outerjoin(comment_stats, comment_stats.c.user_id == User.id)
+        .order_by(User.id.desc())
+        .all()
+    )
+
 def update_user(db: Session, user_id: int, user_update: UserUpdate):
     db_user = get_user(db, user_id)
     if not db_user:
@@ -45,13 +147,39 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate):
     for key, value in user_update.dict(exclude_unset=True).items():
         setattr(db_user, key, value)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 def delete_user(db: Session, user_id: int):
+    """Delete an account and everything it owns without loading any of it.
+
+    Small accounts go at once through ON DELETE CASCADE. Accounts owning more
+    than PURGE_THRESHOLD blogs, comments and interactions are marked deleted,
+    together with their blogs, and left to the purge job.
+    """
+    User = models.user.User
+    Blog = models.blog.Blog
     db_user = get_user(db, user_id)
     if not db_user:
         return None
-    db.delete(db_user)
+
+    # Blogs removed by the database cascade bypass the ORM hook that writes tombstones.
+    db.execute(models.blog.tombstones_for(Blog.author_id == user_id, Blog.deleted_at.is_(None)))
+    owned = union_all(
+        select(Blog.id).where(Blog.author_id == user_id),
+        select(models.Comment.id).where(models.Comment.user_id == user_id),
+        select(models.BlogInteraction.blog_id).where(models.BlogInteraction.user_id == user_id),
+    )
+    if exceeds(db, owned, PURGE_THRESHOLD):
+        now = datetime.now(timezone.utc)
+        db.execute(
+            update(Blog)
+            .where(Blog.author_id == user_id, Blog.deleted_at.is_(None))
+            .values(deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db_user.deleted_at = now
+    else:
+        db.delete(db_user)
     db.commit()
+    cache.invalidate(cache.USERS, [user_id])
     return db_user
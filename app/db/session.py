@@ -1,17 +1,260 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from decouple import config
+import itertools
+import threading
+import time
+from math import ceil
+from typing import List, Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, with_loader_criteria
+from decouple import Csv, config
+from app.core.metrics import Gauge, InstrumentedQueuePool, instrument_engine, register
+from app.core import slow_queries
+from app.models.blog import Blog
+from app.models.user import User
 
 DATABASE_URL = config("DATABASE_URL")
+SQL_ECHO = config("SQL_ECHO", default=False, cast=bool)
+
+# Optional read replicas; safe read endpoints use them through get_read_db.
+DATABASE_REPLICA_URLS = config("DATABASE_REPLICA_URLS", default="", cast=Csv())
+REPLICA_MAX_LAG_SECONDS = config("REPLICA_MAX_LAG_SECONDS", default=5.0, cast=float)
+REPLICA_LAG_CHECK_SECONDS = config("REPLICA_LAG_CHECK_SECONDS", default=2.0, cast=float)
+# Clients that wrote within this window read from the primary so they see their
+# own changes. The write time travels in a cookie, so it holds across workers.
+READ_YOUR_WRITES_SECONDS = config("READ_YOUR_WRITES_SECONDS", default=10.0, cast=float)
+READ_YOUR_WRITES_COOKIE = "last_write"
+
+_engine: Engine | None = None
+_engine_lock = threading.Lock()
+
+
+def _create_engine(url: str) -> Engine:
+    engine = create_engine(url, echo=SQL_ECHO, poolclass=InstrumentedQueuePool)
+    instrument_engine(engine)
+    slow_queries.instrument_engine(engine)
+    return engine
+
+
+def get_engine() -> Engine:
+    """Create the engine on first use, so importing the app never touches the database."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine(DATABASE_URL)
+    return _engine
+
+
+# Lag is 0 when everything received has been replayed; otherwise the age of
+# the last replayed transaction. On a primary both LSN functions return NULL.
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() IS NULL "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine: Engine | None = None
+        self.lag = 0.0
+        self.checked_at = float("-inf")
+        self._lock = threading.RLock()
+
+    def get_engine(self) -> Engine:
+        if self.engine is None:
+            with self._lock:
+                if self.engine is None:
+                    self.engine = _create_engine(self.url)
+        return self.engine
+
+    def is_fresh(self) -> bool:
+        now = time.monotonic()
+        if now - self.checked_at >= REPLICA_LAG_CHECK_SECONDS and self._lock.acquire(blocking=False):
+            try:
+                self.lag = self._measure_lag()
+                self.checked_at = now
+            finally:
+                self._lock.release()
+        return self.lag <= REPLICA_MAX_LAG_SECONDS
+
+    def _measure_lag(self) -> float:
+        engine = self.get_engine()
+        if engine.dialect.name != "postgresql":
+            return 0.0
+        try:
+            with engine.connect() as connection:
+                return float(connection.execute(_REPLICA_LAG_SQL).scalar() or 0)
+        except Exception:
+            return float("inf")
 
-engine = create_engine(DATABASE_URL, echo=True)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_replicas: List[Replica] = [Replica(url) for url in DATABASE_REPLICA_URLS]
+_replica_cycle = itertools.count()
 
 
-def get_db():
-    db = SessionLocal()
+def last_write_at(request: Optional[Request]) -> Optional[float]:
+    """When this client last committed a write, from the cookie set on that response."""
+    if request is None:
+        return None
+    wrote_at = getattr(request.state, "last_write", None)
+    if wrote_at is not None:
+        return wrote_at
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, ""))
+    except ValueError:
+        return None
+
+
+def wrote_recently(wrote_at: Optional[float]) -> bool:
+    # Wall-clock time, since the write may have happened in another worker.
+    return wrote_at is not None and 0 <= time.time() - wrote_at < READ_YOUR_WRITES_SECONDS
+
+
+def pick_replica(wrote_at: Optional[float] = None) -> Engine | None:
+    """A replica engine within the lag budget, or None to use the primary."""
+    if not _replicas or wrote_recently(wrote_at):
+        return None
+    start = next(_replica_cycle)
+    for offset in range(len(_replicas)):
+        replica = _replicas[(start + offset) % len(_replicas)]
+        if replica.is_fresh():
+            return replica.get_engine()
+    return None
+
+
+def dispose_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+    for replica in _replicas:
+        if replica.engine is not None:
+            replica.engine.dispose()
+            replica.engine = None
+
+
+class RoutingSession(Session):
+    """Binds lazily: to the primary, or for read-only sessions to a fresh replica.
+
+    The choice is made at the first query and kept for the session. Clients
+    whose last_write cookie is recent stay on the primary (read-your-writes).
+    """
+
+    def get_bind(self, mapper=None, **kw):
+        if kw.get("bind") is not None:
+            # An explicit bind_arguments={"bind": ...} wins, e.g. to read from the primary.
+            return kw["bind"]
+        if not self.info.get("read_only"):
+            return get_engine()
+
+        bind = self.info.get("bind")
+        if bind is None:
+            bind = self.info["bind"] = pick_replica(last_write_at(self.info.get("request"))) or get_engine()
+        return bind
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _flag_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _hide_soft_deleted(orm_execute_state):
+    # Soft-deleted blogs and users are invisible everywhere except to the purge
+    # job, which opts out with execution_options(include_deleted=True).
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+        and not orm_execute_state.execution_options.get("include_deleted", False)
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            with_loader_criteria(Blog, lambda cls: cls.deleted_at.is_(None), include_aliases=True),
+            with_loader_criteria(User, lambda cls: cls.deleted_at.is_(None), include_aliases=True),
+        )
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session):
+    request = session.info.get("request")
+    if session.info.pop("wrote", False) and request is not None:
+        # ReadYourWritesMiddleware turns this into the last_write cookie.
+        request.state.last_write = time.time()
+
+
+# Objects stay loaded after commit; server-generated columns come back through
+# RETURNING (eager_defaults on the models) instead of a refresh per object.
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+async def release_session(db: Session):
+    # Only a session that began a transaction holds a connection; returning it
+    # means a ROLLBACK round trip, which must not run on the event loop.
+    if db.in_transaction():
+        await run_in_threadpool(db.close)
+    else:
+        db.close()
+
+
+# Sessions check out a connection at their first query, not when created. The
+# dependencies are async so requests that never query (cache hits, rejected
+# tokens) open and close their session without a threadpool hop either.
+async def get_db(request: Request):
+    db = SessionLocal(info={"request": request})
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        await release_session(db)
+
+
+async def get_read_db(request: Request):
+    """Session for safe reads; served by a replica when one is configured and fresh."""
+    db = SessionLocal(info={"read_only": True, "request": request})
+    try:
+        yield db
+    finally:
+        await release_session(db)
+
+
+class ReadYourWritesMiddleware:
+    """Sets the last_write cookie on responses to requests that committed a write."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                wrote_at = scope.get("state", {}).get("last_write")
+                if wrote_at is not None:
+                    cookie = (
+                        f"{READ_YOUR_WRITES_COOKIE}={wrote_at:.3f}; Max-Age={ceil(READ_YOUR_WRITES_SECONDS)}; "
+                        "Path=/; HttpOnly; Secure; SameSite=None"
+                    )
+                    message.setdefault("headers", []).append((b"set-cookie", cookie.encode()))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def pool_checked_out() -> int:
+    engines = [_engine] + [replica.engine for replica in _replicas]
+    return sum(engine.pool.checkedout() for engine in engines if engine is not None)
+
+
+register(Gauge("blogbox_db_pool_checked_out", "Connections checked out of the primary and replica pools.", pool_checked_out))
@@ -1,19 +1,45 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
 
-from app.api.routes import admin, auth, blog, attachment
+from app.api.routes import admin, auth, blog, attachment, users
 from app.db.base import Base
-from app.db.session import engine
+from app.db.session import ReadYourWritesMiddleware, dispose_engine, get_engine
 from decouple import config
-from app.core import cloudinary_config
+from app.core import cache_bus, cloudinary_config, live_counters
+from app.core.config import AUTO_CREATE_SCHEMA, RUN_BACKGROUND_WORKER
+from app.tasks.worker import worker
+from app.core.admission import AdmissionMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    cloudinary_config.configure()
+    if AUTO_CREATE_SCHEMA:
+        Base.metadata.create_all(bind=get_engine())
+    if RUN_BACKGROUND_WORKER:
+        worker.start()
+    cache_bus.start()
+    try:
+        yield
+    finally:
+        live_counters.hub.close()
+        cache_bus.stop()
+        worker.stop()
+        dispose_engine()
 
-frontend_url = config("FRONTEND_URL", default="http://localhost:5173")
 
+app = FastAPI(lifespan=lifespan)
+
+frontend_url = config("FRONTEND_URL", default="http://localhost:5173")
 
+# Inside CORS and metrics, so shed requests still get CORS headers and are counted.
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[frontend_url],
@@ -21,12 +47,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
 def read_root():
     return {"message": "BlogBox backend is running 🚀"}
 
+@app.get("/healthz", include_in_schema=False)
+def healthz():
+    return {"status": "ok"}
+
+@app.get("/readyz", include_in_schema=False)
+def readyz():
+    try:
+        with get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as exc:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "detail": type(exc).__name__})
+    return {"status": "ready"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(blog.router, prefix="/api/v1/blogs", tags=["blogs"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["blogs"])
-app.include_router(attachment.router, prefix="/api/v1/attachments", tags=["attachments"])
\ No newline at end of file
+app.include_router(attachment.router, prefix="/api/v1/attachments", tags=["attachments"])
+app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
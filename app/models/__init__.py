@@ -1,3 +1,5 @@
 from .user import User
-from .blog import Blog, Comment, Attachment
-from .blog_interaction import BlogInteraction
\ No newline at end of file
+from .blog import Blog, BlogTombstone, Comment, Attachment
+from .blog_interaction import BlogInteraction
+from .media import MediaDeletion
+from .analytics import EngagementEvent, BlogDailyStats, AuthorStats
\ No newline at end of file
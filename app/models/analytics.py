@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class EngagementEvent(Base):
+    """Counter deltas appended by write paths and consumed by the rollup job."""
+    __tablename__ = "engagement_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False, index=True)
+    reads = Column(SmallInteger, default=0, nullable=False)
+    likes = Column(SmallInteger, default=0, nullable=False)
+    unlikes = Column(SmallInteger, default=0, nullable=False)
+    comments = Column(SmallInteger, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class BlogDailyStats(Base):
+    __tablename__ = "blog_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    blog_id = Column(Integer, primary_key=True, index=True)
+    reads = Column(Integer, default=0, nullable=False)
+    likes = Column(Integer, default=0, nullable=False)
+    unlikes = Column(Integer, default=0, nullable=False)
+    comments = Column(Integer, default=0, nullable=False)
+
+
+class AuthorStats(Base):
+    """Per-author totals kept in step with blog writes; reads and likes count published blogs only."""
+    __tablename__ = "author_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    post_count = Column(Integer, default=0, nullable=False)
+    published_count = Column(Integer, default=0, nullable=False)
+    total_reads = Column(BigInteger, default=0, nullable=False)
+    total_likes = Column(BigInteger, default=0, nullable=False)
+    total_unlikes = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,38 +1,105 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Text, ForeignKey, DateTime, Boolean, Sequence, event, insert, select
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import func
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
+# One counter for every blog write and delete; /blogs/changes pages through it.
+blog_change_seq = Sequence("blog_change_seq", metadata=Base.metadata)
+
+
+class next_change_seq(FunctionElement):
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(next_change_seq, "postgresql")
+def _next_change_seq_postgresql(element, compiler, **kw):
+    return "nextval('blog_change_seq')"
+
+
+@compiles(next_change_seq)
+def _next_change_seq_default(element, compiler, **kw):
+    # Databases without sequences (SQLite in development) serialise writers,
+    # so the current maximum plus one is safe there.
+    return (
+        "(SELECT coalesce(max(change_seq), 0) + 1 FROM "
+        "(SELECT change_seq FROM blogs UNION ALL SELECT change_seq FROM blog_tombstones))"
+    )
+
+
 class Blog(Base):
     __tablename__ = "blogs"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
+    # Bumped on every content change; content patches must name the version they were made against.
+    content_version = Column(Integer, default=1, nullable=False)
     image = Column(String, nullable=True)
-    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set when a large blog is deleted; the purge job removes it and its children later.
+    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
     read_count = Column(Integer, default=0)
     likes = Column(Integer, default=0)
     unlikes = Column(Integer, default=0)
     is_published = Column(Boolean, default=True)
+    # Set once the blog has been public; only such blogs are reported as unpublished to /blogs/changes.
+    was_published = Column(Boolean, default=False, nullable=False)
+    change_seq = Column(BigInteger, default=next_change_seq(), onupdate=next_change_seq(), nullable=False, index=True)
 
     author = relationship("User", back_populates="blogs")
-    comments = relationship("Comment", back_populates="blog", cascade="all, delete-orphan")
-    interactions = relationship("BlogInteraction", back_populates="blog", cascade="all, delete-orphan")
-    attachments = relationship("Attachment", back_populates="blog", cascade="all, delete-orphan")
+    # Children are removed by ON DELETE CASCADE, never loaded just to be deleted.
+    comments = relationship("Comment", back_populates="blog", cascade="all, delete-orphan", passive_deletes=True)
+    interactions = relationship("BlogInteraction", back_populates="blog", cascade="all, delete-orphan", passive_deletes=True)
+    attachments = relationship("Attachment", back_populates="blog", cascade="all, delete-orphan", passive_deletes=True)
+
+
+class BlogTombstone(Base):
+    """Marks a deleted blog so clients syncing from /blogs/changes can drop it."""
+    __tablename__ = "blog_tombstones"
+
+    blog_id = Column(Integer, primary_key=True)
+    author_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+@event.listens_for(Blog, "before_insert")
+@event.listens_for(Blog, "before_update")
+def _remember_published(mapper, connection, blog):
+    # is_published is still None on insert when left to its column default (True).
+    if blog.is_published is not False:
+        blog.was_published = True
+
+
+@event.listens_for(Blog, "before_delete")
+def _write_tombstone(mapper, connection, blog):
+    connection.execute(
+        insert(BlogTombstone).values(blog_id=blog.id, author_id=blog.author_id, change_seq=next_change_seq())
+    )
 
 
+def tombstones_for(*criteria):
+    """INSERT writing tombstones for the matching blogs, for deletes that bypass the ORM."""
+    return insert(BlogTombstone).from_select(
+        ["blog_id", "author_id", "change_seq"],
+        select(Blog.id, Blog.author_id, next_change_seq()).where(*criteria),
+    )
 
 
 class Comment(Base):
     __tablename__ = "comments"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    blog_id = Column(Integer, ForeignKey("blogs.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False, index=True)
     is_approved = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -42,11 +109,12 @@ class Comment(Base):
 
 class Attachment(Base):
     __tablename__ = "attachments"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     file_url = Column(String, nullable=False)
     file_public_id = Column(String, nullable=False)  
-    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False)
+    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     blog = relationship("Blog", back_populates="attachments")
\ No newline at end of file
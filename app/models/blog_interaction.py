@@ -1,19 +1,45 @@
-from sqlalchemy import Column, Integer, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, SmallInteger, ForeignKey, DateTime, Index
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from app.db.base import Base
 from sqlalchemy.orm import relationship
 
+SEEN = 1
+LIKED = 2
+UNLIKED = 4
+
+
+def interaction_flags(seen: bool = False, liked: bool = False, unliked: bool = False) -> int:
+    return (SEEN if seen else 0) | (LIKED if liked else 0) | (UNLIKED if unliked else 0)
+
+
+def _flag(bit: int, name: str) -> hybrid_property:
+    def getter(self) -> bool:
+        return bool((self.flags or 0) & bit)
+
+    def setter(self, value: bool):
+        self.flags = (self.flags or 0) | bit if value else (self.flags or 0) & ~bit
+
+    def expression(cls):
+        return (cls.flags.op("&")(bit) != 0).label(name)
+
+    return hybrid_property(getter, setter, expr=expression)
+
+
 class BlogInteraction(Base):
+    """One row per (blog, user); seen/liked/unliked are bits of ``flags``."""
     __tablename__ = "blog_interactions"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (Index("ix_blog_interactions_user_id", "user_id"),)
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False)
-    seen = Column(Boolean, default=False)
-    liked = Column(Boolean, default=False)
-    unliked = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    flags = Column(SmallInteger, default=0, nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
+    seen = _flag(SEEN, "seen")
+    liked = _flag(LIKED, "liked")
+    unliked = _flag(UNLIKED, "unliked")
+
     user = relationship("User", back_populates="interactions")
     blog = relationship("Blog", back_populates="interactions")
@@ -5,6 +5,7 @@ from sqlalchemy.orm import relationship
 
 class User(Base):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
@@ -15,10 +16,12 @@ class User(Base):
     is_superuser = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_login = Column(DateTime(timezone=True), nullable=True)
+    # Set when a large account is deleted; the purge job removes it and its content later.
+    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
-    blogs = relationship("Blog", back_populates="author")
-    comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan")
-    interactions = relationship("BlogInteraction", back_populates="user", cascade="all, delete-orphan")
+    blogs = relationship("Blog", back_populates="author", cascade="all, delete-orphan", passive_deletes=True)
+    comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    interactions = relationship("BlogInteraction", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 
 
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+
+BULK_MAX_IDS = 1000
+
+class UserBulkFilter(BaseModel):
+    is_active: Optional[bool] = None
+    q: Optional[str] = None
+
+class BlogBulkFilter(BaseModel):
+    author_id: Optional[int] = None
+    is_published: Optional[bool] = None
+
+class _BulkSelection(BaseModel):
+    ids: Optional[List[int]] = Field(default=None, max_length=BULK_MAX_IDS)
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        selection = getattr(self, "filter")
+        if self.ids is None and selection is None:
+            raise ValueError("Either ids or filter must be given")
+        if self.ids is not None and not self.ids:
+            raise ValueError("ids must not be empty")
+        # An empty filter would select every row.
+        if selection is not None and not any(value not in (None, "") for value in selection.model_dump().values()):
+            raise ValueError("filter must set at least one criterion")
+        return self
+
+class UserBulkActiveUpdate(_BulkSelection):
+    is_active: bool
+    filter: Optional[UserBulkFilter] = None
+
+class BlogBulkPublishUpdate(_BulkSelection):
+    is_published: bool
+    filter: Optional[BlogBulkFilter] = None
+
+class BulkUpdateResult(BaseModel):
+    updated: int
+    ids: List[int]
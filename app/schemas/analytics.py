@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+class EngagementCounts(BaseModel):
+    reads: int = 0
+    likes: int = 0
+    unlikes: int = 0
+    comments: int = 0
+
+class EngagementPoint(EngagementCounts):
+    day: date
+
+    model_config = {"from_attributes": True}
+
+class TopBlog(EngagementCounts):
+    blog_id: int
+    title: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+class AnalyticsOut(BaseModel):
+    start: date
+    end: date
+    series: List[EngagementPoint]
+    top_blogs: List[TopBlog]
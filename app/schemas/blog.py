@@ -1,8 +1,9 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 from app.schemas.interaction import InteractionOut
 from app.schemas.user import BlogAuthorOut
+from app.schemas.attachment import AttachmentOut
 from typing import Optional
 
 class BlogBase(BaseModel):
@@ -18,9 +19,33 @@ class BlogUpdate(BlogBase):
     title: Optional[str] = None
     content: Optional[str] = None
 
+class ContentEdit(BaseModel):
+    """Replace content[start:end] with ``text``, counted in the base version.
+
+    Offsets are Unicode code points, not the UTF-16 code units of a JavaScript
+    string: an emoji counts as one, so clients must convert (e.g. by indexing
+    ``Array.from(content)``).
+    """
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+    text: str = ""
+
+class BlogContentPatch(BaseModel):
+    base_version: int
+    edits: List[ContentEdit]
+
+class BlogContentOut(BaseModel):
+    id: int
+    content_version: int
+    # In code points, like the edit offsets.
+    content_length: int
+    changed: bool
+    updated_at: Optional[datetime] = None
+
 class BlogOut(BlogBase):
     id: int
     author_id: int
+    content_version: int
     read_count: int
     likes: int
     unlikes: int
@@ -29,7 +54,24 @@ class BlogOut(BlogBase):
 
     author: BlogAuthorOut
     interaction: Optional[InteractionOut] = None
+    # Only filled when requested with include=attachments; the alias keeps
+    # model_validate from lazy-loading Blog.attachments for every blog.
+    attachments: Optional[List[AttachmentOut]] = Field(default=None, validation_alias="included_attachments")
 
     model_config = {"from_attributes": True}
 
 
+
+
+class BlogRemovedOut(BaseModel):
+    id: int
+    reason: Literal["deleted", "unpublished"]
+
+
+class BlogChangesOut(BaseModel):
+    changed: List[BlogOut]
+    removed: List[BlogRemovedOut]
+    # Pass back as ``since``; keep polling straight away while has_more is true.
+    # has_more stays false while next_token is held back behind unsettled changes.
+    next_token: int
+    has_more: bool
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, constr
-from typing import Optional, Annotated
+from typing import List, Optional, Annotated
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -36,6 +36,16 @@ class UserOut(UserBase):
         "from_attributes": True
     }
 
+class AdminUserOut(UserOut):
+    blog_count: int = 0
+    comment_count: int = 0
+    total_likes: int = 0
+
+class PaginatedAdminUsers(BaseModel):
+    items: List[AdminUserOut]
+    next_cursor: Optional[int] = None
+    limit: int
+
 class BlogAuthorOut(BaseModel):
     id: int
     username: str
@@ -46,4 +56,15 @@ class BlogAuthorOut(BaseModel):
 
 class ChangePassword(BaseModel):
     current_password: Annotated[str, constr(min_length=6)]
-    new_password: Annotated[str, constr(min_length=6)]
\ No newline at end of file
+    new_password: Annotated[str, constr(min_length=6)]
+class AuthorStatsOut(BaseModel):
+    user_id: int
+    post_count: int = 0
+    published_count: int = 0
+    total_reads: int = 0
+    total_likes: int = 0
+    total_unlikes: int = 0
+
+    model_config = {
+        "from_attributes": True
+    }
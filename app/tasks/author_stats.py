@@ -0,0 +1,16 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.crud.author_stats import repair_author_stats
+
+logger = logging.getLogger(__name__)
+
+
+def repair_all_author_stats(db: Session) -> int:
+    """Nightly safety net: rewrite every author_stats row that drifted from blogs."""
+    repaired = repair_author_stats(db)
+    db.commit()
+    if repaired:
+        logger.info("Repaired %d author_stats rows", repaired)
+    return repaired
@@ -0,0 +1,128 @@
+import argparse
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import MEDIA_GC_BATCH_SIZE, MEDIA_GC_MIN_AGE_HOURS
+from app.core.storage import MediaStorage, get_storage, public_id_from_url
+from app.crud.media import enqueue_media_deletions
+from app.models.blog import Attachment, Blog
+from app.models.media import MediaDeletion
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH_SIZE = 1000
+REPORT_SAMPLE_SIZE = 50
+
+
+@dataclass
+class MediaGCReport:
+    dry_run: bool
+    referenced: int = 0
+    scanned: int = 0
+    orphaned: int = 0
+    skipped_recent: int = 0
+    queued: int = 0
+    sample: List[str] = field(default_factory=list)
+
+
+def _stream(db: Session, column) -> Iterator[str]:
+    # yield_per turns on server-side cursors, so only one batch is held in memory at a time.
+    stmt = select(column).where(column.isnot(None)).execution_options(yield_per=STREAM_BATCH_SIZE)
+    for (value,) in db.execute(stmt):
+        yield value
+
+
+def iter_referenced_public_ids(db: Session) -> Iterator[str]:
+    yield from _stream(db, Attachment.file_public_id)
+    yield from _stream(db, MediaDeletion.public_id)
+
+    for column in (Blog.image, User.profile_pic):
+        for url in _stream(db, column):
+            public_id = public_id_from_url(url)
+            if public_id:
+                yield public_id
+
+
+def collect_orphaned_media(
+    db: Session,
+    storage: MediaStorage | None = None,
+    dry_run: bool = True,
+    batch_size: int = MEDIA_GC_BATCH_SIZE,
+    min_age: timedelta = timedelta(hours=MEDIA_GC_MIN_AGE_HOURS),
+) -> MediaGCReport:
+    """Queue deletion of stored assets no row references any more.
+
+    Assets younger than ``min_age`` are left alone: clients upload straight to
+    storage before registering the attachment, so a fresh asset may simply not
+    be referenced yet. Ids already in the outbox count as referenced.
+    """
+    storage = storage or get_storage()
+    report = MediaGCReport(dry_run=dry_run)
+
+    referenced: Set[str] = set(iter_referenced_public_ids(db))
+    report.referenced = len(referenced)
+    cutoff = datetime.now(timezone.utc) - min_age
+
+    pending: List[str] = []
+    for public_id, created_at in storage.iter_assets():
+        report.scanned += 1
+        if public_id in referenced:
+            continue
+        if created_at > cutoff:
+            report.skipped_recent += 1
+            continue
+
+        report.orphaned += 1
+        if len(report.sample) < REPORT_SAMPLE_SIZE:
+            report.sample.append(public_id)
+
+        if not dry_run:
+            pending.append(public_id)
+            if len(pending) >= batch_size:
+                report.queued += _queue(db, pending)
+                pending = []
+
+    if pending:
+        report.queued += _queue(db, pending)
+
+    return report
+
+
+def _queue(db: Session, public_ids: List[str]) -> int:
+    enqueue_media_deletions(db, public_ids)
+    db.commit()
+    logger.info("Queued %d orphaned assets for deletion", len(public_ids))
+    return len(public_ids)
+
+
+if __name__ == "__main__":
+    from app.core import cloudinary_config
+    from app.db.session import SessionLocal
+
+    cloudinary_config.configure()
+
+    parser = argparse.ArgumentParser(description="Find and delete media no blog, attachment or user references.")
+    parser.add_argument("--apply", action="store_true", help="queue orphans for deletion instead of only reporting them")
+    parser.add_argument("--min-age-hours", type=int, default=MEDIA_GC_MIN_AGE_HOURS)
+    parser.add_argument("--batch-size", type=int, default=MEDIA_GC_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        report = collect_orphaned_media(
+            db,
+            dry_run=not args.apply,
+            batch_size=args.batch_size,
+            min_age=timedelta(hours=args.min_age_hours),
+        )
+        print(json.dumps(asdict(report), indent=2))
+    finally:
+        db.close()
@@ -0,0 +1,81 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.core.config import MEDIA_OUTBOX_BATCH_SIZE, MEDIA_OUTBOX_MAX_ATTEMPTS
+from app.core.storage import MediaStorage, get_storage
+from app.models.media import MediaDeletion
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 6 * 60 * 60
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+def process_media_outbox(db: Session, storage: MediaStorage | None = None, batch_size: int = MEDIA_OUTBOX_BATCH_SIZE) -> int:
+    """Send one batch of queued deletions to storage. Returns the number of rows handled."""
+    storage = storage or get_storage()
+    now = datetime.now(timezone.utc)
+
+    rows = (
+        db.query(MediaDeletion)
+        .filter(
+            MediaDeletion.next_attempt_at <= now,
+            MediaDeletion.attempts < MEDIA_OUTBOX_MAX_ATTEMPTS,
+        )
+        .order_by(MediaDeletion.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not rows:
+        db.rollback()
+        return 0
+
+    public_ids = list(dict.fromkeys(row.public_id for row in rows))
+    error = None
+    try:
+        done = storage.delete_many(public_ids)
+    except Exception as exc:
+        logger.warning("Media deletion batch of %d failed: %s", len(public_ids), exc)
+        done = set()
+        error = str(exc)
+
+    for row in rows:
+        if row.public_id in done:
+            db.delete(row)
+        else:
+            row.attempts += 1
+            row.next_attempt_at = now + backoff_delay(row.attempts)
+            row.last_error = error or "Not deleted by storage backend"
+
+    db.commit()
+    return len(rows)
+
+
+def drain_media_outbox(db: Session, storage: MediaStorage | None = None) -> int:
+    total = 0
+    while True:
+        handled = process_media_outbox(db, storage)
+        if not handled:
+            return total
+        total += handled
+
+
+if __name__ == "__main__":
+    from app.core import cloudinary_config
+    from app.db.session import SessionLocal
+
+    cloudinary_config.configure()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        print(f"Processed {drain_media_outbox(db)} queued deletions")
+    finally:
+        db.close()
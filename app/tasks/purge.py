@@ -0,0 +1,93 @@
+import logging
+
+from sqlalchemy import delete, exists, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import PURGE_BATCH_SIZE
+from app.models.analytics import EngagementEvent
+from app.models.blog import Attachment, Blog, Comment
+from app.models.blog_interaction import BlogInteraction
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _delete_some(db: Session, key: tuple, *criteria, batch_size: int) -> int:
+    """Delete at most ``batch_size`` rows matching ``criteria``, identified by the ``key`` columns."""
+    model = key[0].class_
+    ids = select(*key).where(*criteria).limit(batch_size)
+    target = tuple_(*key) if len(key) > 1 else key[0]
+    return db.execute(
+        delete(model).where(target.in_(ids)).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def _purge_children(db: Session, children, batch_size: int) -> int:
+    for key, criteria in children:
+        deleted = _delete_some(db, key, *criteria, batch_size=batch_size)
+        if deleted:
+            return deleted
+    return 0
+
+
+def purge_deleted_batch(db: Session, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Remove one bounded batch of rows belonging to soft-deleted blogs and users.
+
+    Children go first, one table at a time; the blog or user row itself is
+    deleted once nothing is left under it. The target row stays locked until
+    the batch commits, so concurrent purges pick different targets. Returns
+    the number of rows removed.
+    """
+    deleted_blogs = (
+        select(Blog.id)
+        .where(Blog.deleted_at.isnot(None))
+        .order_by(Blog.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .execution_options(include_deleted=True)
+    )
+    blog_id = db.execute(deleted_blogs).scalar()
+    if blog_id is not None:
+        removed = _purge_children(db, (
+            ((Comment.id,), (Comment.blog_id == blog_id,)),
+            ((BlogInteraction.blog_id, BlogInteraction.user_id), (BlogInteraction.blog_id == blog_id,)),
+            ((Attachment.id,), (Attachment.blog_id == blog_id,)),
+            ((EngagementEvent.id,), (EngagementEvent.blog_id == blog_id,)),
+        ), batch_size)
+        if not removed:
+            removed = db.execute(delete(Blog).where(Blog.id == blog_id)).rowcount
+        db.commit()
+        return removed
+
+    deleted_users = (
+        select(User.id)
+        .where(User.deleted_at.isnot(None), ~exists().where(Blog.author_id == User.id))
+        .order_by(User.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .execution_options(include_deleted=True)
+    )
+    user_id = db.execute(deleted_users).scalar()
+    if user_id is not None:
+        removed = _purge_children(db, (
+            ((Comment.id,), (Comment.user_id == user_id,)),
+            ((BlogInteraction.blog_id, BlogInteraction.user_id), (BlogInteraction.user_id == user_id,)),
+        ), batch_size)
+        if not removed:
+            removed = db.execute(delete(User).where(User.id == user_id)).rowcount
+        db.commit()
+        return removed
+
+    db.rollback()
+    return 0
+
+
+def purge_deleted(db: Session, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    total = 0
+    while True:
+        removed = purge_deleted_batch(db, batch_size)
+        if not removed:
+            if total:
+                logger.info("Purged %d rows of deleted blogs and users", total)
+            return total
+        total += removed
@@ -0,0 +1,98 @@
+import logging
+from collections import defaultdict
+from datetime import timezone
+
+from sqlalchemy import Date, cast, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import ENGAGEMENT_ROLLUP_BATCH_SIZE
+from app.models.analytics import BlogDailyStats, EngagementEvent
+
+logger = logging.getLogger(__name__)
+
+
+METRICS = ("reads", "likes", "unlikes", "comments")
+
+
+def _upsert_daily(insert):
+    """Add the inserted counters to any existing blog/day row."""
+    return insert.on_conflict_do_update(
+        index_elements=[BlogDailyStats.day, BlogDailyStats.blog_id],
+        set_={metric: getattr(BlogDailyStats, metric) + insert.excluded[metric] for metric in METRICS},
+    )
+
+
+def rollup_engagement_batch(db: Session, batch_size: int = ENGAGEMENT_ROLLUP_BATCH_SIZE) -> int:
+    """Fold one batch of engagement events into blog_daily_stats.
+
+    The events are deleted and summed in the same transaction, and only the
+    rows a worker deleted are counted, so every event is counted exactly once.
+    Returns the number of blog/day rows touched.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        touched = _rollup_postgres(db, batch_size)
+    else:
+        touched = _rollup_sqlite(db, batch_size)
+    db.commit()
+    return touched
+
+
+def _claimed(batch_size: int):
+    return select(EngagementEvent.id).order_by(EngagementEvent.id).limit(batch_size)
+
+
+def _consumed(claimed):
+    return delete(EngagementEvent).where(EngagementEvent.id.in_(claimed)).returning(
+        EngagementEvent.blog_id,
+        EngagementEvent.reads,
+        EngagementEvent.likes,
+        EngagementEvent.unlikes,
+        EngagementEvent.comments,
+        EngagementEvent.created_at,
+    )
+
+
+def _rollup_postgres(db: Session, batch_size: int) -> int:
+    # One statement: concurrent workers skip each other's rows.
+    consumed = _consumed(_claimed(batch_size).with_for_update(skip_locked=True)).cte("consumed")
+
+    day = cast(func.timezone("UTC", consumed.c.created_at), Date)
+    totals = select(
+        day,
+        consumed.c.blog_id,
+        *(func.sum(consumed.c[metric]) for metric in METRICS),
+    ).group_by(day, consumed.c.blog_id)
+
+    stmt = postgresql.insert(BlogDailyStats).from_select(["day", "blog_id", *METRICS], totals)
+    return db.execute(_upsert_daily(stmt)).rowcount
+
+
+def _rollup_sqlite(db: Session, batch_size: int) -> int:
+    # SQLite has no DELETE in a CTE; the DELETE ... RETURNING takes the write
+    # lock first, so the rows summed here are exactly the ones removed.
+    totals = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    for row in db.execute(_consumed(_claimed(batch_size))):
+        created_at = row.created_at
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc)
+        counters = totals[(created_at.date(), row.blog_id)]
+        for metric in METRICS:
+            counters[metric] += getattr(row, metric)
+    if not totals:
+        return 0
+
+    stmt = sqlite.insert(BlogDailyStats).values([
+        {"day": day, "blog_id": blog_id, **counters} for (day, blog_id), counters in totals.items()
+    ])
+    db.execute(_upsert_daily(stmt))
+    return len(totals)
+
+
+def rollup_engagement(db: Session) -> int:
+    total = 0
+    while True:
+        touched = rollup_engagement_batch(db)
+        if not touched:
+            return total
+        total += touched
@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal, get_engine
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """A job run every ``interval`` seconds.
+
+    ``delay_first_run`` waits one interval after start instead of running at
+    boot. ``exclusive`` jobs run in one process at a time across all workers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[Session], object],
+        delay_first_run: bool = False,
+        exclusive: bool = False,
+    ):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.delay_first_run = delay_first_run
+        self.exclusive = exclusive
+        self.next_run = 0.0
+
+
+@contextmanager
+def job_lock(job: PeriodicJob) -> Iterator[bool]:
+    """Hold a Postgres advisory lock named after the job; yields whether it was acquired."""
+    engine = get_engine()
+    if not job.exclusive or engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    key = zlib.crc32(f"blogbox-job:{job.name}".encode())
+    # Session-level lock on a connection of its own, so the job may commit freely.
+    with engine.connect() as connection:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+
+class BackgroundWorker:
+    """Runs periodic jobs on a daemon thread, each with its own short-lived session."""
+
+    def __init__(self, jobs: List[PeriodicJob], tick: float = 1.0):
+        self.jobs = jobs
+        self.tick = tick
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        now = time.monotonic()
+        for job in self.jobs:
+            job.next_run = now + job.interval if job.delay_first_run else 0.0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="blogbox-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_job(self, job: PeriodicJob):
+        db = SessionLocal()
+        try:
+            with job_lock(job) as acquired:
+                if acquired:
+                    job.func(db)
+                else:
+                    logger.debug("Skipping %s; another process is running it", job.name)
+        except Exception:
+            db.rollback()
+            logger.exception("Background job %s failed", job.name)
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for job in self.jobs:
+                if self._stop.is_set():
+                    break
+                if now >= job.next_run:
+                    self.run_job(job)
+                    job.next_run = time.monotonic() + job.interval
+            self._stop.wait(self.tick)
+
+
+def default_jobs() -> List[PeriodicJob]:
+    from app.core.config import (
+        AUTHOR_STATS_REPAIR_INTERVAL_SECONDS,
+        ENGAGEMENT_ROLLUP_INTERVAL_SECONDS,
+        MEDIA_OUTBOX_INTERVAL_SECONDS,
+        PURGE_INTERVAL_SECONDS,
+    )
+    from app.tasks.author_stats import repair_all_author_stats
+    from app.tasks.media_outbox import drain_media_outbox
+    from app.tasks.purge import purge_deleted
+    from app.tasks.rollups import rollup_engagement
+
+    return [
+        PeriodicJob("media_outbox", MEDIA_OUTBOX_INTERVAL_SECONDS, drain_media_outbox),
+        PeriodicJob("engagement_rollup", ENGAGEMENT_ROLLUP_INTERVAL_SECONDS, rollup_engagement),
+        PeriodicJob(
+            "author_stats_repair",
+            AUTHOR_STATS_REPAIR_INTERVAL_SECONDS,
+            repair_all_author_stats,
+            delay_first_run=True,
+            exclusive=True,
+        ),
+        PeriodicJob("purge_deleted", PURGE_INTERVAL_SECONDS, purge_deleted, exclusive=True),
+    ]
+
+
+worker = BackgroundWorker(default_jobs())
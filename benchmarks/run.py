@@ -0,0 +1,244 @@
+"""Drive the API at fixed concurrency and report latency percentiles as JSON.
+
+    python -m benchmarks.run --concurrency 16 --requests 2000 --output results/main.json
+    python -m benchmarks.run --base-url http://127.0.0.1:8000 ...   # against uvicorn
+    python -m benchmarks.run --uvicorn --workers 4 ...              # spawn uvicorn first
+
+Without --base-url or --uvicorn the app is driven in-process through
+httpx.ASGITransport. The database in DATABASE_URL must be seeded with
+benchmarks.seed first.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import select
+
+from benchmarks.seed import BENCH_EMAIL, BENCH_PASSWORD
+
+API = "/api/v1"
+
+
+class Context:
+    def __init__(self, blog_ids, tokens, seed):
+        self.blog_ids = blog_ids
+        self.tokens = tokens
+        self.rng = random.Random(seed)
+
+    def blog_id(self):
+        return self.rng.choice(self.blog_ids)
+
+    def auth(self):
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+
+def anonymous_feed(client, ctx):
+    return client.get(f"{API}/blogs/", params={"page": ctx.rng.randint(1, 20), "page_size": 10})
+
+
+def authenticated_feed(client, ctx):
+    return client.get(f"{API}/blogs/", params={"page": ctx.rng.randint(1, 20), "page_size": 10}, headers=ctx.auth())
+
+
+def blog_detail(client, ctx):
+    return client.get(f"{API}/blogs/{ctx.blog_id()}", headers=ctx.auth())
+
+
+def like_toggle(client, ctx):
+    return client.post(f"{API}/blogs/{ctx.blog_id()}/like", headers=ctx.auth())
+
+
+def mark_seen(client, ctx):
+    return client.post(f"{API}/blogs/{ctx.blog_id()}/mark-seen", headers=ctx.auth())
+
+
+def comments_page(client, ctx):
+    return client.get(f"{API}/blogs/{ctx.blog_id()}/comments", params={"skip": 0, "limit": 10}, headers=ctx.auth())
+
+
+def login(client, ctx):
+    index = ctx.rng.randrange(len(ctx.tokens))
+    return client.post(f"{API}/auth/login", json={"email": BENCH_EMAIL.format(index), "password": BENCH_PASSWORD})
+
+
+SCENARIOS = {
+    "anonymous_feed": anonymous_feed,
+    "authenticated_feed": authenticated_feed,
+    "blog_detail": blog_detail,
+    "like_toggle": like_toggle,
+    "mark_seen": mark_seen,
+    "comments_page": comments_page,
+    "login": login,
+}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+async def run_scenario(client, name, ctx, concurrency, requests, warmup):
+    func = SCENARIOS[name]
+    latencies = []
+    errors = 0
+    remaining = warmup + requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            measured = remaining < requests
+            started = time.perf_counter()
+            try:
+                response = await func(client, ctx)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - started
+            if measured:
+                latencies.append(elapsed)
+                errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1]) if latencies else None,
+    }
+
+
+async def fetch_tokens(client, count):
+    tokens = []
+    for index in range(count):
+        response = await client.post(f"{API}/auth/login", json={"email": BENCH_EMAIL.format(index), "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+
+def load_blog_ids(limit):
+    from app.db.session import SessionLocal
+    from app.models.blog import Blog
+
+    db = SessionLocal()
+    try:
+        return db.scalars(select(Blog.id).where(Blog.is_published == True).order_by(Blog.id).limit(limit)).all()
+    finally:
+        db.close()
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_uvicorn(port, workers):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/readyz").status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+async def main_async(args):
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from app.main import app
+
+        transport, base_url = httpx.ASGITransport(app=app), "http://bench"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        ctx = Context(load_blog_ids(args.blog_pool), await fetch_tokens(client, args.users), args.seed)
+        if not ctx.blog_ids:
+            raise SystemExit("No published blogs found; run python -m benchmarks.seed first")
+
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(client, name, ctx, args.concurrency, args.requests, args.warmup)
+            print(f"{name:20} {json.dumps(results[name])}", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--uvicorn", action="store_true", help="spawn uvicorn and benchmark it over HTTP")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20, help="bench users to log in and spread load over")
+    parser.add_argument("--blog-pool", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    process = None
+    if args.uvicorn:
+        process, args.base_url = start_uvicorn(args.port, args.workers)
+    try:
+        results = asyncio.run(main_async(args))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "commit": git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "target": args.base_url or "in-process",
+        "workers": args.workers if args.uvicorn else None,
+        "concurrency": args.concurrency,
+        "requests_per_scenario": args.requests,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
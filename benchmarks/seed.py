@@ -0,0 +1,172 @@
+"""Seed a benchmark database with a reproducible dataset.
+
+    DATABASE_URL=postgresql://.../blogbox_bench python -m benchmarks.seed --users 500 --blogs 5000
+
+Everything is generated from ``--seed`` so two runs produce identical data.
+Use a dedicated database: ``--truncate`` empties every BlogBox table first.
+"""
+import argparse
+import json
+import random
+import time
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.models import Attachment, Blog, BlogInteraction, Comment, User
+from app.models.blog_interaction import interaction_flags
+
+BENCH_PASSWORD = "bench-password"
+BENCH_EMAIL = "bench{}@example.com"
+
+
+def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _insert_returning_ids(db, model, rows, batch_size):
+    ids = []
+    for chunk in _chunks(rows, batch_size):
+        ids.extend(db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), chunk))
+    return ids
+
+
+def _insert(db, model, rows, batch_size):
+    for chunk in _chunks(rows, batch_size):
+        db.execute(insert(model), chunk)
+
+
+def truncate(db):
+    for table in reversed(Base.metadata.sorted_tables):
+        db.execute(delete(table))
+    db.commit()
+
+
+def seed(db, users=200, blogs=2000, comments=10000, interactions=20000, attachments=2000,
+         seed=42, batch_size=5000, unpublished_ratio=0.05):
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    # bcrypt is deliberately slow, so every bench user shares one hash.
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    user_ids = _insert_returning_ids(db, User, [
+        {
+            "username": f"bench_user_{i}",
+            "email": BENCH_EMAIL.format(i),
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "is_superuser": False,
+        }
+        for i in range(users)
+    ], batch_size)
+
+    blog_ids = _insert_returning_ids(db, Blog, [
+        {
+            "title": f"Benchmark post {i}",
+            "content": " ".join(rng.choice(("lorem", "ipsum", "dolor", "sit", "amet")) for _ in range(rng.randint(50, 400))),
+            "author_id": rng.choice(user_ids),
+            "is_published": rng.random() >= unpublished_ratio,
+            "read_count": 0,
+            "likes": 0,
+            "unlikes": 0,
+        }
+        for i in range(blogs)
+    ], batch_size)
+
+    _insert(db, Comment, [
+        {
+            "content": f"Benchmark comment {i}",
+            "blog_id": rng.choice(blog_ids),
+            "user_id": rng.choice(user_ids),
+            "is_approved": rng.random() > 0.1,
+        }
+        for i in range(comments)
+    ], batch_size)
+
+    interactions = min(interactions, users * blogs)
+    pairs = set()
+    while len(pairs) < interactions:
+        pairs.add((rng.choice(user_ids), rng.choice(blog_ids)))
+    interaction_rows = []
+    for user_id, blog_id in sorted(pairs):
+        reaction = rng.random()
+        interaction_rows.append({
+            "user_id": user_id,
+            "blog_id": blog_id,
+            "flags": interaction_flags(seen=True, liked=reaction < 0.3, unliked=0.3 <= reaction < 0.4),
+        })
+    _insert(db, BlogInteraction, interaction_rows, batch_size)
+
+    _insert(db, Attachment, [
+        {
+            "file_url": f"https://res.cloudinary.com/bench/raw/upload/v1/bench/file_{i}.pdf",
+            "file_public_id": f"bench/file_{i}",
+            "blog_id": rng.choice(blog_ids),
+        }
+        for i in range(attachments)
+    ], batch_size)
+
+    # Bring the denormalized counters in line with the generated interactions.
+    def counted(condition):
+        return (
+            select(func.count())
+            .where(BlogInteraction.blog_id == Blog.id, condition)
+            .scalar_subquery()
+        )
+
+    db.execute(update(Blog).values(
+        read_count=counted(BlogInteraction.seen == True),
+        likes=counted(BlogInteraction.liked == True),
+        unlikes=counted(BlogInteraction.unliked == True),
+    ).execution_options(synchronize_session=False))
+    db.commit()
+
+    return {
+        "seed": seed,
+        "users": len(user_ids),
+        "blogs": len(blog_ids),
+        "comments": comments,
+        "interactions": len(interaction_rows),
+        "attachments": attachments,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--blogs", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=10000)
+    parser.add_argument("--interactions", type=int, default=20000)
+    parser.add_argument("--attachments", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--truncate", action="store_true", help="delete all existing rows first")
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal, get_engine
+
+    Base.metadata.create_all(bind=get_engine())
+    db = SessionLocal()
+    try:
+        if args.truncate:
+            truncate(db)
+        summary = seed(
+            db,
+            users=args.users,
+            blogs=args.blogs,
+            comments=args.comments,
+            interactions=args.interactions,
+            attachments=args.attachments,
+            seed=args.seed,
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure app import and lifespan startup time, and check import has no side effects.
+
+    python -m benchmarks.startup --runs 5 --max-import-ms 1500
+
+Each run happens in a fresh interpreter. The process exits non-zero if the
+import opened a database engine or the median exceeds the given budgets, so
+it can guard against startup regressions in CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.db import session
+engine_created_on_import = session._engine is not None
+
+async def lifespan():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        pass
+
+lifespan_started = time.perf_counter()
+asyncio.run(lifespan())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "lifespan_ms": (time.perf_counter() - lifespan_started) * 1000,
+    "engine_created_on_import": engine_created_on_import,
+}))
+"""
+
+
+def measure(runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", PROBE],
+            text=True,
+            env={**os.environ, "RUN_BACKGROUND_WORKER": "false", "AUTO_CREATE_SCHEMA": "false"},
+        )
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, help="fail if the median import time is above this")
+    parser.add_argument("--max-lifespan-ms", type=float, help="fail if the median lifespan startup is above this")
+    args = parser.parse_args()
+
+    samples = measure(args.runs)
+    report = {
+        "runs": args.runs,
+        "import_ms_median": round(statistics.median(s["import_ms"] for s in samples), 2),
+        "lifespan_ms_median": round(statistics.median(s["lifespan_ms"] for s in samples), 2),
+        "engine_created_on_import": any(s["engine_created_on_import"] for s in samples),
+    }
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if report["engine_created_on_import"]:
+        failures.append("importing app.main created a database engine")
+    if args.max_import_ms is not None and report["import_ms_median"] > args.max_import_ms:
+        failures.append(f"median import {report['import_ms_median']}ms > {args.max_import_ms}ms")
+    if args.max_lifespan_ms is not None and report["lifespan_ms_median"] > args.max_lifespan_ms:
+        failures.append(f"median lifespan startup {report['lifespan_ms_median']}ms > {args.max_lifespan_ms}ms")
+    if failures:
+        sys.exit("; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Settings are read at import time, so they must be in place before the app is
+# imported. The databases are always throwaway ones: the tests empty every table.
+_tmpdir = tempfile.mkdtemp(prefix="blogbox-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/primary.db"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("CLOUDINARY_CLOUD_NAME", "test")
+os.environ.setdefault("CLOUDINARY_API_KEY", "test")
+os.environ.setdefault("CLOUDINARY_API_SECRET", "test")
+os.environ["MEDIA_STORAGE_BACKEND"] = "fake"
+os.environ["RUN_BACKGROUND_WORKER"] = "false"
+os.environ.setdefault("CACHE_BUS_BACKEND", "local")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event
+
+from app.core import cache
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.db.session import SessionLocal, get_engine
+from app.main import app
+from app.models.user import User
+
+
+@pytest.fixture(scope="session")
+def tmpdir_path():
+    return _tmpdir
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores ON DELETE CASCADE unless asked to; Postgres always applies it.
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    event.listen(get_engine(), "connect", _enable_foreign_keys)
+    Base.metadata.create_all(get_engine())
+    yield
+    Base.metadata.drop_all(get_engine())
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+    with get_engine().begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(delete(table))
+    # SQLite reuses ids, so nothing cached may outlive the rows it came from.
+    cache.invalidate_all_local()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def user(db):
+    user = User(username="alice", email="alice@example.com", hashed_password="not-a-real-hash")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+
+@pytest.fixture
+def admin(db):
+    admin = User(username="root", email="root@example.com", hashed_password="not-a-real-hash", is_superuser=True)
+    db.add(admin)
+    db.commit()
+    return admin
+
+
+@pytest.fixture
+def admin_headers(admin):
+    return {"Authorization": f"Bearer {create_access_token({'sub': admin.email})}"}
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """Invalidations sent to other workers, as (namespace, keys) pairs."""
+    messages = []
+    monkeypatch.setattr(cache, "_publisher", lambda namespace, keys: messages.append((namespace, keys)))
+    return messages
+
+
+@pytest.fixture
+def count_statements():
+    """Context manager collecting the SQL statements run on the primary engine."""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(get_engine(), "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(get_engine(), "before_cursor_execute", record)
+
+    return counting
@@ -0,0 +1,100 @@
+import pytest
+
+from app.core import cache
+from app.models.blog import Blog
+from app.models.user import User
+
+
+@pytest.fixture
+def users(db):
+    users = [
+        User(username=name, email=f"{name}@example.com", hashed_password="not-a-real-hash", is_active=active)
+        for name, active in [("bob", True), ("bea", True), ("carl", False)]
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+@pytest.fixture
+def blogs(db, user, users):
+    blogs = [
+        Blog(title="A", content="...", author_id=user.id, is_published=True),
+        Blog(title="B", content="...", author_id=user.id, is_published=False),
+        Blog(title="C", content="...", author_id=users[0].id, is_published=True),
+    ]
+    db.add_all(blogs)
+    db.commit()
+    return blogs
+
+
+def active_usernames(db):
+    db.expire_all()
+    return sorted(user.username for user in db.query(User).filter(User.is_active == True))
+
+
+def test_deactivate_users_by_ids(client, db, admin, admin_headers, users, published):
+    response = client.post(
+        "/api/v1/admin/users/bulk-active", headers=admin_headers, json={"is_active": False, "ids": [users[0].id]}
+    )
+
+    assert response.json() == {"updated": 1, "ids": [users[0].id]}
+    assert active_usernames(db) == ["bea", "root"]
+    assert published == [(cache.USERS, [users[0].id])]
+
+
+def test_users_filter_never_touches_superusers(client, db, admin, admin_headers, users):
+    response = client.post(
+        "/api/v1/admin/users/bulk-active", headers=admin_headers, json={"is_active": False, "filter": {"q": "b"}}
+    )
+
+    assert sorted(response.json()["ids"]) == sorted([users[0].id, users[1].id])
+    assert active_usernames(db) == ["root"]
+
+
+def test_publish_blogs_by_filter(client, db, user, admin_headers, blogs, published):
+    response = client.post(
+        "/api/v1/admin/blogs/bulk-publish",
+        headers=admin_headers,
+        json={"is_published": False, "filter": {"author_id": user.id}},
+    )
+
+    assert response.json() == {"updated": 1, "ids": [blogs[0].id]}
+    db.expire_all()
+    assert [blog.is_published for blog in blogs] == [False, False, True]
+    assert published == [(cache.BLOGS, [blogs[0].id]), (cache.FEEDS, None)]
+
+
+def test_publish_blogs_by_ids(client, db, admin_headers, blogs, published):
+    response = client.post(
+        "/api/v1/admin/blogs/bulk-publish",
+        headers=admin_headers,
+        json={"is_published": True, "ids": [blogs[1].id, blogs[2].id]},
+    )
+
+    assert response.json() == {"updated": 1, "ids": [blogs[1].id]}
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/v1/admin/users/bulk-active", {"is_active": False}),
+    ("/api/v1/admin/users/bulk-active", {"is_active": False, "ids": []}),
+    ("/api/v1/admin/users/bulk-active", {"is_active": False, "filter": {}}),
+    ("/api/v1/admin/users/bulk-active", {"is_active": False, "filter": {"q": ""}}),
+    ("/api/v1/admin/blogs/bulk-publish", {"is_published": False, "ids": []}),
+    ("/api/v1/admin/blogs/bulk-publish", {"is_published": False, "filter": {}}),
+])
+def test_empty_selection_is_rejected(client, db, admin_headers, users, blogs, published, path, body):
+    response = client.post(path, headers=admin_headers, json=body)
+
+    assert response.status_code == 422
+    assert active_usernames(db) == ["alice", "bea", "bob", "root"]
+    assert [blog.is_published for blog in blogs] == [True, False, True]
+    assert published == []
+
+
+def test_bulk_updates_need_a_superuser(client, auth_headers, users):
+    response = client.post(
+        "/api/v1/admin/users/bulk-active", headers=auth_headers, json={"is_active": False, "ids": [users[0].id]}
+    )
+
+    assert response.status_code == 403
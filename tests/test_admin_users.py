@@ -0,0 +1,67 @@
+import pytest
+
+from app.models.blog import Blog, Comment
+from app.models.user import User
+
+
+@pytest.fixture
+def users(db):
+    users = [
+        User(username=f"user{index}", email=f"user{index}@example.com", hashed_password="not-a-real-hash", is_active=index != 3)
+        for index in range(5)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def list_users(client, headers, **params):
+    response = client.get("/api/v1/admin/users", headers=headers, params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_pages_follow_next_cursor_newest_first(client, admin_headers, users):
+    first = list_users(client, admin_headers, limit=2)
+    second = list_users(client, admin_headers, limit=2, cursor=first["next_cursor"])
+    third = list_users(client, admin_headers, limit=2, cursor=second["next_cursor"])
+
+    ids = [item["id"] for page in (first, second, third) for item in page["items"]]
+    assert ids == [user.id for user in reversed(users)]
+    assert first["next_cursor"] == first["items"][-1]["id"]
+    assert third["next_cursor"] is None
+
+
+def test_last_full_page_has_no_next_cursor(client, admin_headers, users):
+    page = list_users(client, admin_headers, limit=5)
+
+    assert len(page["items"]) == 5
+    assert page["next_cursor"] is None
+
+
+def test_superusers_are_not_listed_and_filters_apply(client, admin_headers, users):
+    everyone = list_users(client, admin_headers, limit=100)["items"]
+    inactive = list_users(client, admin_headers, is_active=False)["items"]
+    by_prefix = list_users(client, admin_headers, q="USER4")["items"]
+
+    assert "root" not in {item["username"] for item in everyone}
+    assert [item["username"] for item in inactive] == ["user3"]
+    assert [item["username"] for item in by_prefix] == ["user4"]
+
+
+def test_items_carry_activity_stats(client, db, admin_headers, users):
+    author = users[0]
+    blogs = [Blog(title=f"B{index}", content="...", author_id=author.id, likes=index + 1) for index in range(2)]
+    db.add_all(blogs)
+    db.flush()
+    db.add_all(Comment(content="c", user_id=author.id, blog_id=blogs[0].id) for _ in range(3))
+    db.commit()
+
+    items = {item["id"]: item for item in list_users(client, admin_headers, limit=100)["items"]}
+
+    assert (items[author.id]["blog_count"], items[author.id]["comment_count"], items[author.id]["total_likes"]) == (2, 3, 3)
+    assert (items[users[1].id]["blog_count"], items[users[1].id]["comment_count"], items[users[1].id]["total_likes"]) == (0, 0, 0)
+
+
+def test_listing_needs_a_superuser(client, auth_headers):
+    assert client.get("/api/v1/admin/users", headers=auth_headers).status_code == 403
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import Gate
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_slots_are_handed_over_in_fifo_order():
+    async def scenario():
+        gate = Gate("test", limit=1, queue_size=5, timeout=1)
+        assert await gate.acquire()
+        order = []
+
+        async def wait(name):
+            assert await gate.acquire()
+            order.append(name)
+
+        tasks = [asyncio.create_task(wait(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        for _ in tasks:
+            gate.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        gate.release()
+        return order, gate.active
+
+    assert run(scenario()) == (["a", "b", "c"], 0)
+
+
+def test_full_queue_rejects_at_once():
+    async def scenario():
+        gate = Gate("test", limit=1, queue_size=1, timeout=1)
+        assert await gate.acquire()
+        queued = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        rejected = await gate.acquire()
+        gate.release()
+        return rejected, await queued
+
+    assert run(scenario()) == (False, True)
+
+
+def test_waiter_times_out_and_leaves_the_queue():
+    async def scenario():
+        gate = Gate("test", limit=1, queue_size=1, timeout=0.01)
+        assert await gate.acquire()
+        timed_out = await gate.acquire()
+        gate.release()
+        return timed_out, gate.active, len(gate._waiters)
+
+    assert run(scenario()) == (False, 0, 0)
+
+
+def test_slot_handed_over_as_the_wait_times_out_is_kept(monkeypatch):
+    real_wait_for = asyncio.wait_for
+
+    async def late_wait_for(future, timeout):
+        # What wait_for can do on Python 3.12+: the result arrives, then the timeout wins.
+        await real_wait_for(future, timeout)
+        raise asyncio.TimeoutError
+
+    async def scenario():
+        gate = Gate("test", limit=1, queue_size=1, timeout=1)
+        assert await gate.acquire()
+        monkeypatch.setattr(asyncio, "wait_for", late_wait_for)
+        waiting = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        gate.release()
+        acquired = await waiting
+        gate.release()
+        return acquired, gate.active
+
+    assert run(scenario()) == (True, 0)
+
+
+def test_cancelled_waiter_gives_back_a_slot_it_was_handed():
+    async def scenario():
+        gate = Gate("test", limit=1, queue_size=2, timeout=1)
+        assert await gate.acquire()
+        first = asyncio.create_task(gate.acquire())
+        second = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        gate.release()
+        first.cancel()
+        # Depending on the Python version the handover or the cancellation wins;
+        # either way the slot must end up with exactly one owner.
+        (outcome,) = await asyncio.gather(first, return_exceptions=True)
+        if outcome is True:
+            gate.release()
+        else:
+            assert isinstance(outcome, asyncio.CancelledError)
+        acquired = await second
+        gate.release()
+        return acquired, gate.active, len(gate._waiters)
+
+    assert run(scenario()) == (True, 0, 0)
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        gate = Gate("test", limit=1, queue_size=1, timeout=1)
+        assert await gate.acquire()
+        waiting = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        gate.release()
+        return gate.active, len(gate._waiters)
+
+    assert run(scenario()) == (0, 0)
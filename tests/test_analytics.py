@@ -0,0 +1,111 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.models.analytics import BlogDailyStats, EngagementEvent
+from app.models.blog import Blog
+from app.tasks.rollups import rollup_engagement, rollup_engagement_batch
+
+DAY_ONE = datetime(2026, 3, 1, 23, 30, tzinfo=timezone.utc)
+DAY_TWO = datetime(2026, 3, 2, 0, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def blogs(db, user):
+    blogs = [Blog(title="First", content="...", author_id=user.id), Blog(title="Second", content="...", author_id=user.id)]
+    db.add_all(blogs)
+    db.commit()
+    return blogs
+
+
+def add_events(db, *events):
+    db.add_all(EngagementEvent(blog_id=blog.id, created_at=at, **counters) for blog, at, counters in events)
+    db.commit()
+
+
+def daily(db):
+    db.expire_all()
+    return {
+        (row.day, row.blog_id): (row.reads, row.likes, row.unlikes, row.comments)
+        for row in db.query(BlogDailyStats)
+    }
+
+
+def test_rollup_sums_events_per_blog_and_utc_day(db, blogs):
+    first, second = blogs
+    add_events(
+        db,
+        (first, DAY_ONE, {"reads": 1}),
+        (first, DAY_ONE, {"likes": 1}),
+        (first, DAY_TWO, {"reads": 1}),
+        (second, DAY_ONE, {"comments": 1}),
+    )
+
+    assert rollup_engagement_batch(db) == 3
+
+    assert daily(db) == {
+        (date(2026, 3, 1), first.id): (1, 1, 0, 0),
+        (date(2026, 3, 2), first.id): (1, 0, 0, 0),
+        (date(2026, 3, 1), second.id): (0, 0, 0, 1),
+    }
+    assert db.query(EngagementEvent).count() == 0
+
+
+def test_rollup_adds_to_existing_rows_in_batches(db, blogs):
+    first = blogs[0]
+    add_events(db, *[(first, DAY_ONE, {"likes": 1})] * 3)
+    assert rollup_engagement_batch(db, batch_size=2) == 1
+    assert daily(db) == {(date(2026, 3, 1), first.id): (0, 2, 0, 0)}
+
+    add_events(db, (first, DAY_ONE, {"unlikes": 1}))
+
+    assert rollup_engagement(db) == 1
+    assert rollup_engagement_batch(db) == 0
+    assert daily(db) == {(date(2026, 3, 1), first.id): (0, 3, 1, 0)}
+
+
+def test_like_reaches_the_daily_stats(client, db, auth_headers, blogs):
+    assert client.post(f"/api/v1/blogs/{blogs[0].id}/like", headers=auth_headers).status_code == 200
+
+    rollup_engagement(db)
+
+    assert list(daily(db).values()) == [(0, 1, 0, 0)]
+
+
+def test_analytics_series_and_top_blogs(client, db, admin_headers, blogs):
+    first, second = blogs
+    add_events(
+        db,
+        (first, DAY_ONE, {"likes": 1}),
+        (second, DAY_ONE, {"likes": 1}),
+        (second, DAY_TWO, {"likes": 1, "reads": 1}),
+    )
+    rollup_engagement(db)
+
+    response = client.get(
+        "/api/v1/admin/analytics",
+        headers=admin_headers,
+        params={"start": "2026-03-01", "end": "2026-03-02", "metric": "likes", "top": 1},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [(point["day"], point["likes"], point["reads"]) for point in body["series"]] == [
+        ("2026-03-01", 2, 0),
+        ("2026-03-02", 1, 1),
+    ]
+    assert [(blog["blog_id"], blog["title"], blog["likes"]) for blog in body["top_blogs"]] == [(second.id, "Second", 2)]
+
+    filtered = client.get(
+        "/api/v1/admin/analytics",
+        headers=admin_headers,
+        params={"start": "2026-03-01", "end": "2026-03-02", "blog_id": first.id},
+    ).json()
+    assert [point["likes"] for point in filtered["series"]] == [1]
+
+
+def test_analytics_rejects_reversed_range_and_non_admins(client, admin_headers, auth_headers):
+    params = {"start": "2026-03-02", "end": "2026-03-01"}
+
+    assert client.get("/api/v1/admin/analytics", headers=admin_headers, params=params).status_code == 400
+    assert client.get("/api/v1/admin/analytics", headers=auth_headers).status_code == 403
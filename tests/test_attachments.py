@@ -0,0 +1,69 @@
+import pytest
+
+from app.models.blog import Attachment, Blog
+from app.models.media import MediaDeletion
+from app.models.user import User
+
+
+@pytest.fixture
+def blog(db, user):
+    blog = Blog(title="With files", content="...", author_id=user.id)
+    db.add(blog)
+    db.commit()
+    return blog
+
+
+def files(*names):
+    return [{"file_url": f"https://cdn.example.com/{name}.png", "file_public_id": f"blogbox/{name}"} for name in names]
+
+
+def test_bulk_create_returns_rows_in_request_order(client, db, auth_headers, blog):
+    # Names that sort differently from the request show the response follows it.
+    # (SQLite runs ordered RETURNING one row at a time; Postgres batches it.)
+    response = client.post(f"/api/v1/attachments/blog/{blog.id}/bulk", headers=auth_headers, json=files("c", "a", "b"))
+
+    assert response.status_code == 200
+    created = response.json()
+    assert [attachment["file_public_id"] for attachment in created] == ["blogbox/c", "blogbox/a", "blogbox/b"]
+    assert {attachment["blog_id"] for attachment in created} == {blog.id}
+    stored = {row.id: row.file_public_id for row in db.query(Attachment)}
+    assert {attachment["id"]: attachment["file_public_id"] for attachment in created} == stored
+
+
+def test_bulk_create_with_no_files(client, auth_headers, blog):
+    response = client.post(f"/api/v1/attachments/blog/{blog.id}/bulk", headers=auth_headers, json=[])
+
+    assert response.json() == []
+
+
+def test_bulk_create_is_capped(client, db, auth_headers, blog, monkeypatch):
+    monkeypatch.setattr("app.api.routes.attachment.BULK_MAX_ATTACHMENTS", 2)
+
+    response = client.post(f"/api/v1/attachments/blog/{blog.id}/bulk", headers=auth_headers, json=files("a", "b", "c"))
+
+    assert response.status_code == 400
+    assert db.query(Attachment).count() == 0
+
+
+def test_bulk_create_checks_the_blog_and_its_author(client, db, auth_headers, blog):
+    stranger = User(username="eve", email="eve@example.com", hashed_password="not-a-real-hash")
+    db.add(stranger)
+    db.commit()
+    other = Blog(title="Not mine", content="...", author_id=stranger.id)
+    db.add(other)
+    db.commit()
+
+    missing = client.post("/api/v1/attachments/blog/999999/bulk", headers=auth_headers, json=files("a"))
+    forbidden = client.post(f"/api/v1/attachments/blog/{other.id}/bulk", headers=auth_headers, json=files("a"))
+
+    assert (missing.status_code, forbidden.status_code) == (404, 403)
+    assert db.query(Attachment).count() == 0
+
+
+def test_deleting_an_attachment_queues_its_media(client, db, auth_headers, blog):
+    (created,) = client.post(f"/api/v1/attachments/blog/{blog.id}/bulk", headers=auth_headers, json=files("a")).json()
+
+    assert client.delete(f"/api/v1/attachments/{created['id']}", headers=auth_headers).json() == {"id": created["id"]}
+
+    assert db.query(Attachment).count() == 0
+    assert [row.public_id for row in db.query(MediaDeletion)] == ["blogbox/a"]
@@ -0,0 +1,93 @@
+import pytest
+
+from app.crud.author_stats import repair_author_stats
+from app.models.analytics import AuthorStats
+from app.models.blog import Blog
+from app.models.user import User
+
+
+def stats(db, user_id):
+    db.expire_all()
+    row = db.get(AuthorStats, user_id)
+    return row and (row.post_count, row.published_count, row.total_reads, row.total_likes, row.total_unlikes)
+
+
+def create(client, headers, title, published=True):
+    response = client.post(
+        "/api/v1/blogs/", headers=headers, json={"title": title, "content": "...", "is_published": published}
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_stats_follow_blog_writes(client, db, user, auth_headers, admin_headers):
+    public = create(client, auth_headers, "Public")
+    draft = create(client, auth_headers, "Draft", published=False)
+    assert stats(db, user.id) == (2, 1, 0, 0, 0)
+
+    client.post(f"/api/v1/blogs/{public}/like", headers=auth_headers)
+    client.post(f"/api/v1/blogs/{draft}/like", headers=auth_headers)
+    assert stats(db, user.id) == (2, 1, 0, 1, 0)
+
+    client.put(f"/api/v1/blogs/{draft}/toggle-publish/", headers=admin_headers)
+    assert stats(db, user.id) == (2, 2, 0, 2, 0)
+
+    client.delete(f"/api/v1/blogs/{public}", headers=auth_headers)
+    assert stats(db, user.id) == (1, 1, 0, 1, 0)
+
+    # Everything was kept in step, so a repair finds nothing to fix.
+    assert repair_author_stats(db) == 0
+
+
+def test_repair_fixes_drift_and_drops_stale_rows(db, user):
+    other = User(username="bob", email="bob@example.com", hashed_password="not-a-real-hash")
+    db.add(other)
+    db.flush()
+    db.add_all([
+        Blog(title="A", content="...", author_id=user.id, read_count=4, likes=2, unlikes=1),
+        Blog(title="B", content="...", author_id=user.id, is_published=False, likes=7),
+        AuthorStats(user_id=user.id, post_count=9, published_count=9),
+        AuthorStats(user_id=other.id, post_count=3),
+    ])
+    db.commit()
+
+    assert repair_author_stats(db) == 1
+    db.commit()
+
+    assert stats(db, user.id) == (2, 1, 4, 2, 1)
+    assert stats(db, other.id) is None
+    assert repair_author_stats(db) == 0
+
+
+def test_repair_can_target_authors(db, user):
+    db.add_all([Blog(title="A", content="...", author_id=user.id), AuthorStats(user_id=user.id, post_count=5)])
+    db.commit()
+
+    assert repair_author_stats(db, []) == 0
+    assert repair_author_stats(db, [user.id + 1]) == 0
+    assert repair_author_stats(db, [user.id]) == 1
+
+
+@pytest.fixture
+def author_stats(db, user):
+    db.add_all([
+        Blog(title="A", content="...", author_id=user.id, likes=3),
+        Blog(title="B", content="...", author_id=user.id, is_published=False),
+    ])
+    db.commit()
+    repair_author_stats(db)
+    db.commit()
+
+
+def test_drafts_only_count_for_the_author_and_superusers(client, user, auth_headers, admin_headers, author_stats):
+    url = f"/api/v1/users/{user.id}/stats"
+
+    assert client.get(url).json()["post_count"] == 1
+    assert client.get(url, headers=auth_headers).json()["post_count"] == 2
+    assert client.get(url, headers=admin_headers).json()["post_count"] == 2
+    assert client.get(url).json()["total_likes"] == 3
+
+
+def test_user_without_stats_gets_zeros_and_unknown_user_404(client, admin):
+    assert client.get(f"/api/v1/users/{admin.id}/stats").json()["post_count"] == 0
+    assert client.get("/api/v1/users/999999/stats").status_code == 404
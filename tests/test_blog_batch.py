@@ -0,0 +1,59 @@
+from app.models.blog import Blog
+from app.models.blog_interaction import BlogInteraction
+
+
+def add_blogs(db, user, *specs):
+    blogs = [Blog(title=title, content="...", author_id=user.id, is_published=published) for title, published in specs]
+    db.add_all(blogs)
+    db.commit()
+    return blogs
+
+
+def test_batch_keeps_request_order_and_skips_missing(client, db, user, auth_headers):
+    one, two, three = add_blogs(db, user, ("One", True), ("Two", True), ("Three", True))
+
+    response = client.get(
+        "/api/v1/blogs/batch", headers=auth_headers, params={"ids": f"{three.id},999999,{one.id},{three.id}"}
+    )
+
+    assert response.status_code == 200
+    assert [blog["title"] for blog in response.json()] == ["Three", "One"]
+
+
+def test_batch_hides_drafts_from_everyone_but_superusers(client, db, user, auth_headers, admin_headers):
+    public, draft = add_blogs(db, user, ("Public", True), ("Draft", False))
+    params = {"ids": f"{public.id},{draft.id}"}
+
+    assert [blog["id"] for blog in client.get("/api/v1/blogs/batch", headers=auth_headers, params=params).json()] == [
+        public.id
+    ]
+    assert [blog["id"] for blog in client.get("/api/v1/blogs/batch", headers=admin_headers, params=params).json()] == [
+        public.id,
+        draft.id,
+    ]
+
+
+def test_batch_carries_the_caller_interactions(client, db, user, auth_headers):
+    liked, other = add_blogs(db, user, ("Liked", True), ("Other", True))
+    db.add(BlogInteraction(blog_id=liked.id, user_id=user.id, seen=True, liked=True))
+    db.commit()
+
+    blogs = client.get("/api/v1/blogs/batch", headers=auth_headers, params={"ids": f"{liked.id},{other.id}"}).json()
+
+    assert [(blog["interaction"]["liked"], blog["interaction"]["seen"]) for blog in blogs] == [(True, True), (False, False)]
+
+
+def test_batch_caps_and_validates_ids(client, auth_headers, monkeypatch):
+    monkeypatch.setattr("app.api.routes.blog.BATCH_MAX_IDS", 2)
+
+    too_many = client.get("/api/v1/blogs/batch", headers=auth_headers, params={"ids": "1,2,3"})
+    invalid = client.get("/api/v1/blogs/batch", headers=auth_headers, params={"ids": "1,x"})
+    empty = client.get("/api/v1/blogs/batch", headers=auth_headers, params={"ids": ","})
+
+    assert too_many.status_code == 400
+    assert invalid.status_code == 400
+    assert empty.json() == []
+
+
+def test_batch_needs_authentication(client):
+    assert client.get("/api/v1/blogs/batch", params={"ids": "1"}).status_code == 401
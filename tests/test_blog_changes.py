@@ -0,0 +1,99 @@
+import pytest
+
+from app.models.blog import Blog
+
+
+@pytest.fixture
+def settled(monkeypatch):
+    # Treat every change as settled so the token is never held back.
+    monkeypatch.setattr("app.api.routes.blog.CHANGES_SETTLE_SECONDS", -60)
+
+
+def add_blog(db, user, title, **fields):
+    blog = Blog(title=title, content="...", author_id=user.id, **fields)
+    db.add(blog)
+    db.commit()
+    return blog
+
+
+def changes(client, since=0, **params):
+    response = client.get("/api/v1/blogs/changes", params={"since": since, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def titles(page):
+    return [blog["title"] for blog in page["changed"]]
+
+
+def test_token_advances_past_settled_changes(client, db, user, settled):
+    add_blog(db, user, "One")
+    add_blog(db, user, "Two")
+
+    page = changes(client)
+    assert titles(page) == ["One", "Two"]
+    assert page["has_more"] is False
+
+    assert changes(client, page["next_token"]) == {
+        "changed": [], "removed": [], "next_token": page["next_token"], "has_more": False,
+    }
+
+    add_blog(db, user, "Three")
+    assert titles(changes(client, page["next_token"])) == ["Three"]
+
+
+def test_pages_follow_has_more(client, db, user, settled):
+    for title in ("One", "Two", "Three"):
+        add_blog(db, user, title)
+
+    first = changes(client, limit=2)
+    second = changes(client, first["next_token"], limit=2)
+
+    assert (titles(first), first["has_more"]) == (["One", "Two"], True)
+    assert (titles(second), second["has_more"]) == (["Three"], False)
+
+
+def test_token_is_held_back_behind_unsettled_changes(client, db, user):
+    add_blog(db, user, "One")
+    add_blog(db, user, "Two")
+    add_blog(db, user, "Three")
+
+    page = changes(client, limit=2)
+
+    # Both changes are sent, but they are too recent to move the token past,
+    # so the client must not spin on has_more.
+    assert titles(page) == ["One", "Two"]
+    assert page["next_token"] == 0
+    assert page["has_more"] is False
+
+
+def test_deleted_blogs_come_back_as_tombstones(client, db, user, auth_headers, settled):
+    blog = add_blog(db, user, "Doomed")
+    token = changes(client)["next_token"]
+
+    assert client.delete(f"/api/v1/blogs/{blog.id}", headers=auth_headers).status_code == 200
+    page = changes(client, token)
+
+    assert page["changed"] == []
+    assert page["removed"] == [{"id": blog.id, "reason": "deleted"}]
+
+
+def test_unpublished_blogs_are_removed_but_drafts_stay_hidden(client, db, user, settled):
+    public = add_blog(db, user, "Public")
+    token = changes(client)["next_token"]
+    add_blog(db, user, "Draft", is_published=False)
+    public.is_published = False
+    db.commit()
+
+    page = changes(client, token)
+
+    assert page["changed"] == []
+    assert page["removed"] == [{"id": public.id, "reason": "unpublished"}]
+
+
+def test_superusers_see_drafts(client, db, user, admin_headers, settled):
+    add_blog(db, user, "Draft", is_published=False)
+
+    page = client.get("/api/v1/blogs/changes", headers=admin_headers).json()
+
+    assert titles(page) == ["Draft"]
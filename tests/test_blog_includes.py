@@ -0,0 +1,64 @@
+import pytest
+
+from app.models.blog import Attachment, Blog
+
+
+@pytest.fixture
+def blogs(db, user):
+    blogs = [Blog(title=f"Blog {index}", content="...", author_id=user.id) for index in range(3)]
+    db.add_all(blogs)
+    db.flush()
+    db.add_all(
+        Attachment(file_url=f"https://cdn.example.com/{blog.id}/{n}.png", file_public_id=f"blogbox/{blog.id}-{n}", blog_id=blog.id)
+        for blog in blogs[:2]
+        for n in range(2)
+    )
+    db.commit()
+    return blogs
+
+
+def attachment_queries(statements):
+    return [statement for statement in statements if "FROM attachments" in statement]
+
+
+def test_feed_embeds_attachments_in_one_query(client, blogs, count_statements):
+    with count_statements() as statements:
+        response = client.get("/api/v1/blogs/", params={"include": "attachments"})
+
+    assert response.status_code == 200
+    by_title = {blog["title"]: blog["attachments"] for blog in response.json()["data"]}
+    assert by_title["Blog 2"] == []
+    assert [set(attachment) for attachment in by_title["Blog 0"]] == [{"id", "file_url", "file_public_id", "blog_id"}] * 2
+    assert sorted(attachment["file_public_id"] for attachment in by_title["Blog 0"]) == [
+        f"blogbox/{blogs[0].id}-0",
+        f"blogbox/{blogs[0].id}-1",
+    ]
+    assert len(attachment_queries(statements)) == 1
+
+
+def test_attachments_are_neither_loaded_nor_sent_unless_asked(client, blogs, count_statements):
+    with count_statements() as statements:
+        response = client.get("/api/v1/blogs/")
+
+    assert all(blog["attachments"] is None for blog in response.json()["data"])
+    assert attachment_queries(statements) == []
+
+
+def test_detail_batch_and_my_blogs_accept_the_include(client, auth_headers, blogs):
+    params = {"include": "attachments"}
+    detail = client.get(f"/api/v1/blogs/{blogs[0].id}", headers=auth_headers, params=params).json()
+    (batched,) = client.get(
+        "/api/v1/blogs/batch", headers=auth_headers, params={**params, "ids": str(blogs[0].id)}
+    ).json()
+    mine = client.get("/api/v1/blogs/myblogs/", headers=auth_headers, params=params).json()["data"]
+
+    assert len(detail["attachments"]) == 2
+    assert len(batched["attachments"]) == 2
+    assert sorted(len(blog["attachments"]) for blog in mine) == [0, 2, 2]
+
+
+def test_unknown_include_is_rejected(client):
+    response = client.get("/api/v1/blogs/", params={"include": "attachments,comments"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown include: comments"
@@ -0,0 +1,97 @@
+import pytest
+
+from app.crud.blog import apply_content_edits
+from app.models.blog import Blog
+from app.schemas.blog import ContentEdit
+
+
+def edit(start, end, text=""):
+    return ContentEdit(start=start, end=end, text=text)
+
+
+def test_edits_apply_against_the_base_in_any_order():
+    content = "hello world"
+
+    assert apply_content_edits(content, [edit(6, 11, "there"), edit(0, 5, "hi")]) == "hi there"
+
+
+def test_insert_and_delete_at_the_edges():
+    assert apply_content_edits("abc", [edit(0, 0, ">"), edit(3, 3, "<")]) == ">abc<"
+    assert apply_content_edits("abc", [edit(0, 3)]) == ""
+
+
+def test_adjacent_edits_are_not_overlaps():
+    assert apply_content_edits("abcd", [edit(0, 2, "X"), edit(2, 4, "Y")]) == "XY"
+
+
+@pytest.mark.parametrize("edits, message", [
+    ([edit(0, 3), edit(2, 4)], "overlaps"),
+    ([edit(3, 2)], "before its start"),
+    ([edit(2, 5)], "past the end"),
+])
+def test_invalid_edits_are_rejected(edits, message):
+    with pytest.raises(ValueError, match=message):
+        apply_content_edits("abcd", edits)
+
+
+def test_offsets_count_code_points():
+    # One code point in Python, two UTF-16 code units in the browser.
+    assert apply_content_edits("🙂ab", [edit(1, 2, "X")]) == "🙂Xb"
+
+
+@pytest.fixture
+def blog(db, user):
+    blog = Blog(title="Patched", content="hello world", author_id=user.id)
+    db.add(blog)
+    db.commit()
+    return blog
+
+
+def patch(client, headers, blog, base_version, *edits):
+    return client.patch(
+        f"/api/v1/blogs/{blog.id}/content",
+        headers=headers,
+        json={"base_version": base_version, "edits": [e.model_dump() for e in edits]},
+    )
+
+
+def test_patch_bumps_the_version(client, db, auth_headers, blog):
+    response = patch(client, auth_headers, blog, 1, edit(0, 5, "goodbye"))
+
+    assert response.status_code == 200
+    assert response.json()["content_version"] == 2
+    assert response.json()["content_length"] == len("goodbye world")
+    assert response.json()["changed"] is True
+    db.expire_all()
+    assert (blog.content, blog.content_version) == ("goodbye world", 2)
+
+
+def test_no_op_patch_writes_nothing(client, db, auth_headers, blog):
+    response = patch(client, auth_headers, blog, 1, edit(0, 5, "hello"))
+
+    assert response.json()["changed"] is False
+    assert response.json()["content_version"] == 1
+
+
+def test_stale_base_version_conflicts(client, db, auth_headers, blog):
+    assert patch(client, auth_headers, blog, 1, edit(0, 0, "1")).status_code == 200
+
+    response = patch(client, auth_headers, blog, 1, edit(0, 0, "2"))
+
+    assert response.status_code == 409
+    db.expire_all()
+    assert blog.content == "1hello world"
+
+
+def test_invalid_patch_is_unprocessable(client, auth_headers, blog):
+    response = patch(client, auth_headers, blog, 1, edit(0, 99))
+
+    assert response.status_code == 422
+
+
+def test_full_update_bumps_the_version_only_when_content_changes(client, auth_headers, blog):
+    unchanged = client.patch(f"/api/v1/blogs/{blog.id}", headers=auth_headers, json={"content": "hello world"})
+    changed = client.patch(f"/api/v1/blogs/{blog.id}", headers=auth_headers, json={"content": "new"})
+
+    assert unchanged.json()["content_version"] == 1
+    assert changed.json()["content_version"] == 2
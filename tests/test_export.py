@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.blog import Blog, Comment
+from app.models.blog_interaction import BlogInteraction
+from app.models.user import User
+
+
+@pytest.fixture
+def content(db, user):
+    kept = Blog(title="Kept", content="...", author_id=user.id)
+    deleted = Blog(title="Deleted", content="...", author_id=user.id, deleted_at=datetime.now(timezone.utc))
+    gone = User(username="gone", email="gone@example.com", hashed_password="not-a-real-hash", deleted_at=datetime.now(timezone.utc))
+    db.add_all([kept, deleted, gone])
+    db.flush()
+    db.add_all([
+        Comment(content="on kept", user_id=user.id, blog_id=kept.id),
+        Comment(content="by deleted user", user_id=gone.id, blog_id=kept.id),
+        BlogInteraction(blog_id=kept.id, user_id=gone.id, seen=True),
+        Comment(content="on deleted", user_id=user.id, blog_id=deleted.id),
+        BlogInteraction(blog_id=kept.id, user_id=user.id, seen=True, liked=True),
+        BlogInteraction(blog_id=deleted.id, user_id=user.id, seen=True),
+    ])
+    db.commit()
+    return kept, deleted
+
+
+def export(client, headers, resource, **params):
+    response = client.get(f"/api/v1/admin/export/{resource}", headers=headers, params=params)
+    assert response.status_code == 200
+    return response
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_ndjson_export_skips_rows_of_soft_deleted_blogs_and_users(client, admin_headers, content):
+    kept, _ = content
+
+    blogs = ndjson(export(client, admin_headers, "blogs"))
+    comments = ndjson(export(client, admin_headers, "comments"))
+    interactions = ndjson(export(client, admin_headers, "interactions"))
+
+    assert [blog["title"] for blog in blogs] == ["Kept"]
+    assert [comment["content"] for comment in comments] == ["on kept"]
+    assert [(row["blog_id"], row["liked"]) for row in interactions] == [(kept.id, True)]
+
+
+def test_csv_export_has_a_header_and_download_name(client, admin_headers, content):
+    response = export(client, admin_headers, "blogs", format="csv")
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0][:3] == ["id", "title", "content"]
+    assert [row[1] for row in rows[1:]] == ["Kept"]
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="blogs.csv"'
+
+
+def test_since_filters_by_change_time(client, admin_headers, content):
+    later = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    earlier = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+
+    assert export(client, admin_headers, "comments", since=later).text == ""
+    assert len(ndjson(export(client, admin_headers, "comments", since=earlier))) == 1
+
+
+def test_export_needs_a_superuser(client, auth_headers):
+    assert client.get("/api/v1/admin/export/blogs", headers=auth_headers).status_code == 403
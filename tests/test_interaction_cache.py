@@ -0,0 +1,104 @@
+from app.core.interaction_cache import InteractionCache, InteractionState, UserInteractions
+
+LIKED = InteractionState(seen=True, liked=True)
+
+
+class FakeCache(InteractionCache):
+    """Loads from a dict instead of the database; ``during_load`` runs mid-load."""
+
+    def __init__(self, rows, **kwargs):
+        super().__init__(**kwargs)
+        self.rows = rows
+        self.loads = 0
+        self.during_load = None
+
+    def _load(self, db, user_id):
+        self.loads += 1
+        entry = UserInteractions(liked=self.rows.get(user_id, ()))
+        hook, self.during_load = self.during_load, None
+        if hook:
+            hook()
+        return entry
+
+
+def test_hit_does_not_reload():
+    cache = FakeCache({1: [10]})
+
+    assert cache.lookup(None, 1, [10, 11]) == {10: InteractionState(liked=True), 11: InteractionState()}
+    cache.lookup(None, 1, [10])
+
+    assert cache.loads == 1
+
+
+def test_least_recently_used_user_is_evicted():
+    cache = FakeCache({}, max_users=2)
+    cache.lookup(None, 1, [])
+    cache.lookup(None, 2, [])
+    cache.lookup(None, 1, [])
+    cache.lookup(None, 3, [])
+
+    assert list(cache._users) == [1, 3]
+
+
+def test_byte_bound_evicts_and_accounts_size():
+    one_user = UserInteractions(liked=range(100)).nbytes()
+    cache = FakeCache({user_id: range(100) for user_id in (1, 2, 3)}, max_bytes=one_user * 2)
+    for user_id in (1, 2, 3):
+        cache.lookup(None, user_id, [])
+
+    assert list(cache._users) == [2, 3]
+    assert cache.nbytes == sum(entry.nbytes() for entry in cache._users.values())
+
+    cache.drop()
+    assert (len(cache), cache.nbytes) == (0, 0)
+
+
+def test_record_updates_a_cached_user():
+    cache = FakeCache({1: [10]})
+    cache.lookup(None, 1, [])
+
+    cache.record(1, 11, LIKED)
+
+    assert cache.lookup(None, 1, [11]) == {11: LIKED}
+    assert cache.loads == 1
+
+
+def test_load_that_races_a_write_is_not_stored():
+    rows = {1: []}
+    cache = FakeCache(rows)
+
+    def write():
+        rows[1] = [10]
+        cache.record(1, 10, LIKED)
+
+    cache.during_load = write
+    cache.lookup(None, 1, [10])
+
+    assert 1 not in cache._users
+    assert cache.lookup(None, 1, [10]) == {10: InteractionState(liked=True)}
+
+
+def test_older_of_two_concurrent_loads_loses_to_a_write_between_them():
+    rows = {1: []}
+    cache = FakeCache(rows)
+
+    def write_then_second_lookup():
+        rows[1] = [10]
+        cache.record(1, 10, LIKED)
+        # A second miss for the same user starts, and finishes, after the write.
+        cache.lookup(None, 1, [10])
+
+    cache.during_load = write_then_second_lookup
+    cache.lookup(None, 1, [10])
+
+    assert cache.lookup(None, 1, [10]) == {10: InteractionState(liked=True)}
+    assert cache.loads == 2
+    assert cache._loading == {} and cache._generations == {}
+
+
+def test_drop_all_marks_loads_in_flight_stale():
+    cache = FakeCache({1: [10]})
+    cache.during_load = cache.drop
+    cache.lookup(None, 1, [])
+
+    assert 1 not in cache._users
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.live_counters import hub
+from app.main import app
+from app.models.blog import Blog
+
+
+@pytest.fixture
+def blogs(db, user):
+    blogs = [
+        Blog(title="Live", content="...", author_id=user.id),
+        Blog(title="Draft", content="...", author_id=user.id, is_published=False),
+    ]
+    db.add_all(blogs)
+    db.commit()
+    return blogs
+
+
+@pytest.fixture(autouse=True)
+def no_coalescing(monkeypatch):
+    monkeypatch.setattr("app.core.live_counters.LIVE_COALESCE_SECONDS", 0)
+
+
+async def open_stream(path, query=b""):
+    """Run the ASGI app for one GET and hand back its messages as they are sent."""
+    messages = asyncio.Queue()
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query, "root_path": "",
+        "headers": [(b"host", b"testserver")], "client": ("testclient", 50000), "server": ("testserver", 80),
+    }
+    task = asyncio.create_task(app(scope, receive, messages.put))
+
+    async def close():
+        disconnected.set()
+        await asyncio.wait_for(task, 5)
+
+    return messages, close
+
+
+async def next_body(messages):
+    while True:
+        message = await asyncio.wait_for(messages.get(), 5)
+        if message["type"] == "http.response.body":
+            return message["body"].decode()
+
+
+def test_like_sends_one_counters_event(client, auth_headers, blogs):
+    blog = blogs[0]
+
+    async def scenario():
+        messages, close = await open_stream(f"/api/v1/blogs/{blog.id}/live")
+        start = await asyncio.wait_for(messages.get(), 5)
+        assert start["status"] == 200
+        assert dict(start["headers"])[b"content-type"].startswith(b"text/event-stream")
+        assert (await next_body(messages)).startswith("retry: ")
+
+        response = await asyncio.to_thread(client.post, f"/api/v1/blogs/{blog.id}/like", headers=auth_headers)
+        assert response.status_code == 200
+        event = await next_body(messages)
+        await close()
+        return event
+
+    event = asyncio.run(scenario())
+
+    assert hub.connections == 0
+
+    name, data = event.strip().split("\n")
+    assert name == "event: counters"
+    assert json.loads(data.removeprefix("data: ")) == {
+        "blog_id": blog.id, "delta": {"likes": 1}, "counts": {"likes": 1, "unlikes": 0},
+    }
+
+
+def test_streams_only_open_for_published_blogs(client, blogs):
+    live, draft = blogs
+
+    assert client.get(f"/api/v1/blogs/{draft.id}/live").status_code == 404
+    assert client.get("/api/v1/blogs/live", params={"ids": f"{draft.id},999999"}).status_code == 404
+    assert client.get("/api/v1/blogs/live", params={"ids": "x"}).status_code == 400
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.storage import FakeStorage, public_id_from_url
+from app.models.blog import Attachment, Blog
+from app.models.media import MediaDeletion
+from app.tasks.media_gc import collect_orphaned_media
+
+CDN = "https://res.cloudinary.com/demo/image/upload"
+OLD = datetime.now(timezone.utc) - timedelta(days=2)
+
+
+@pytest.mark.parametrize("url, public_id", [
+    (f"{CDN}/v1712345678/blogbox/cover.jpg", "blogbox/cover"),
+    (f"{CDN}/c_fill,w_300/v1712345678/blogbox/cover.jpg", "blogbox/cover"),
+    (f"{CDN}/c_fill,w_300/blogbox/cover.jpg", "blogbox/cover"),
+    (f"{CDN}/blogbox/nested/cover.final.png", "blogbox/nested/cover.final"),
+    ("https://example.com/upload/blogbox/cover.jpg", None),
+    (f"{CDN}/", None),
+    (None, None),
+])
+def test_public_id_from_url(url, public_id):
+    assert public_id_from_url(url) == public_id
+
+
+@pytest.fixture
+def storage(db, user):
+    blog = Blog(title="Referenced", content="...", author_id=user.id, image=f"{CDN}/v1/blogbox/cover.jpg")
+    db.add(blog)
+    db.flush()
+    db.add_all([
+        Attachment(file_url=f"{CDN}/v1/blogbox/file.png", file_public_id="blogbox/file", blog_id=blog.id),
+        MediaDeletion(public_id="blogbox/already-queued"),
+    ])
+    user.profile_pic = f"{CDN}/v1/blogbox/avatar.png"
+    db.commit()
+
+    storage = FakeStorage()
+    for public_id in ("blogbox/cover", "blogbox/file", "blogbox/avatar", "blogbox/already-queued", "blogbox/orphan-1", "blogbox/orphan-2"):
+        storage.add(public_id, OLD)
+    storage.add("blogbox/just-uploaded")
+    return storage
+
+
+def queued(db):
+    return sorted(row.public_id for row in db.query(MediaDeletion))
+
+
+def test_dry_run_reports_orphans_without_queueing(db, storage):
+    report = collect_orphaned_media(db, storage, dry_run=True)
+
+    assert (report.scanned, report.orphaned, report.skipped_recent, report.queued) == (7, 2, 1, 0)
+    assert sorted(report.sample) == ["blogbox/orphan-1", "blogbox/orphan-2"]
+    assert queued(db) == ["blogbox/already-queued"]
+    assert storage.delete_calls == []
+
+
+def test_apply_queues_orphans_in_batches(db, storage):
+    report = collect_orphaned_media(db, storage, dry_run=False, batch_size=1)
+
+    assert (report.orphaned, report.queued) == (2, 2)
+    assert queued(db) == ["blogbox/already-queued", "blogbox/orphan-1", "blogbox/orphan-2"]
+    # Deletion itself is left to the outbox.
+    assert len(storage.assets) == 7
+
+
+def test_recent_assets_are_spared_until_the_grace_window_passes(db, storage):
+    assert collect_orphaned_media(db, storage, min_age=timedelta(hours=1)).skipped_recent == 1
+
+    report = collect_orphaned_media(db, storage, min_age=timedelta(0))
+
+    assert report.skipped_recent == 0
+    assert "blogbox/just-uploaded" in report.sample
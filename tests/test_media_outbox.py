@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import MEDIA_OUTBOX_MAX_ATTEMPTS
+from app.core.storage import FakeStorage
+from app.crud.media import enqueue_media_deletions
+from app.models.media import MediaDeletion
+from app.tasks.media_outbox import drain_media_outbox, process_media_outbox
+
+
+def queue(db, public_ids):
+    enqueue_media_deletions(db, public_ids)
+    db.commit()
+
+
+def test_drain_deletes_in_bulk_batches(db):
+    public_ids = [f"blogbox/{index}" for index in range(5)]
+    storage = FakeStorage(public_ids)
+    queue(db, public_ids)
+
+    handled = [process_media_outbox(db, storage, batch_size=2) for _ in range(4)]
+
+    assert handled == [2, 2, 1, 0]
+    assert storage.delete_calls == [public_ids[0:2], public_ids[2:4], public_ids[4:5]]
+    assert storage.assets == {}
+    assert db.query(MediaDeletion).count() == 0
+
+
+def test_failed_batch_is_retried_after_backoff(db):
+    storage = FakeStorage(["blogbox/a", "blogbox/b"])
+    storage.fail_next = 1
+    queue(db, ["blogbox/a", "blogbox/b"])
+
+    assert drain_media_outbox(db, storage) == 2
+    rows = db.query(MediaDeletion).all()
+    assert [row.attempts for row in rows] == [1, 1]
+    assert all(row.last_error == "Fake storage failure" for row in rows)
+    assert len(storage.assets) == 2
+
+    # Still backing off: nothing is due yet.
+    assert drain_media_outbox(db, storage) == 0
+    assert len(storage.delete_calls) == 1
+
+    for row in rows:
+        row.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+
+    assert drain_media_outbox(db, storage) == 2
+    assert storage.assets == {}
+    assert db.query(MediaDeletion).count() == 0
+
+
+def test_rows_past_max_attempts_are_left_alone(db):
+    storage = FakeStorage(["blogbox/stuck"])
+    db.add(MediaDeletion(public_id="blogbox/stuck", attempts=MEDIA_OUTBOX_MAX_ATTEMPTS))
+    db.commit()
+
+    assert drain_media_outbox(db, storage) == 0
+    assert storage.delete_calls == []
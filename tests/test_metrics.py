@@ -0,0 +1,37 @@
+import re
+
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    return response.text
+
+
+def test_every_metric_is_prefixed(client):
+    names = re.findall(r"^# TYPE (\S+) ", scrape(client), re.MULTILINE)
+
+    assert names
+    assert [name for name in names if not name.startswith("blogbox_")] == []
+    assert {
+        "blogbox_http_request_duration_seconds",
+        "blogbox_cache_bus_messages_total",
+        "blogbox_interaction_cache_users",
+        "blogbox_interaction_cache_bytes",
+        "blogbox_live_counter_connections",
+        "blogbox_user_cache_lookups_total",
+        "blogbox_user_cache_users",
+    } <= set(names)
+
+
+def test_requests_are_recorded_by_route_template(client, auth_headers):
+    client.get("/api/v1/blogs/12345", headers=auth_headers)
+
+    body = scrape(client)
+
+    assert re.search(
+        r'^blogbox_http_request_duration_seconds_count\{method="GET",route="/api/v1/blogs/\{blog_id\}",status="404"\} [1-9]',
+        body,
+        re.MULTILINE,
+    )
+    assert re.search(r'^blogbox_user_cache_lookups_total\{result="\w+"\} [1-9]', body, re.MULTILINE)
@@ -0,0 +1,49 @@
+"""Statements issued by the mutating endpoints, counted on the primary engine."""
+import pytest
+
+from app.models.blog import Blog
+
+
+@pytest.fixture
+def blog(db, user):
+    blog = Blog(title="Counted", content="...", author_id=user.id)
+    db.add(blog)
+    db.commit()
+    return blog
+
+
+@pytest.fixture
+def warm_client(client, auth_headers):
+    # The first authenticated request loads the user into the cache; the counts
+    # below are what a worker with a warm cache issues.
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+    return client
+
+
+@pytest.mark.parametrize(
+    "method, path, body, expected",
+    [
+        # blog, interaction, author stats upsert, engagement insert, blog update, interaction insert
+        ("post", "/api/v1/blogs/{blog}/like", None, 6),
+        # author stats upsert, blog insert
+        ("post", "/api/v1/blogs/", {"title": "New", "content": "Body"}, 2),
+        # blog, blog update
+        ("patch", "/api/v1/blogs/{blog}", {"title": "Renamed"}, 2),
+        # blog, blog update; the bumped content_version must not be re-selected
+        ("patch", "/api/v1/blogs/{blog}", {"content": "Rewritten"}, 2),
+        # blog, guarded content update
+        ("patch", "/api/v1/blogs/{blog}/content", {"base_version": 1, "edits": [{"start": 0, "end": 3, "text": "!"}]}, 2),
+        # blog, engagement insert, comment insert
+        ("post", "/api/v1/blogs/{blog}/comments", {"content": "Nice"}, 3),
+        # user, user update
+        ("patch", "/api/v1/auth/update-profile", {"username": "alicia"}, 2),
+    ],
+)
+def test_statements_per_mutating_endpoint(
+    warm_client, auth_headers, blog, count_statements, method, path, body, expected
+):
+    with count_statements() as statements:
+        response = warm_client.request(method, path.format(blog=blog.id), headers=auth_headers, json=body)
+
+    assert response.is_success, response.text
+    assert len(statements) == expected, statements
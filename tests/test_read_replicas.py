@@ -0,0 +1,57 @@
+"""Read-your-writes across workers, with a second SQLite database standing in for a replica."""
+import pytest
+from sqlalchemy import create_engine
+
+from app.db import session as db_session
+from app.db.base import Base
+from app.models.blog import Blog
+
+
+@pytest.fixture
+def replica(tmpdir_path, monkeypatch):
+    url = f"sqlite:///{tmpdir_path}/replica.db"
+    Base.metadata.create_all(create_engine(url))
+    replica = db_session.Replica(url)
+    monkeypatch.setattr(db_session, "_replicas", [replica])
+    yield replica
+    replica.get_engine().dispose()
+
+
+def test_reads_go_to_the_replica(client, db, user, replica):
+    db.add(Blog(title="Only on the primary", content="...", author_id=user.id))
+    db.commit()
+
+    response = client.get("/api/v1/blogs/")
+
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+
+def test_write_sets_cookie_that_pins_reads_to_the_primary(client, db, user, auth_headers, replica):
+    response = client.post(
+        "/api/v1/blogs/", headers=auth_headers, json={"title": "Fresh", "content": "Just written"}
+    )
+    assert response.status_code == 201
+    assert db_session.READ_YOUR_WRITES_COOKIE in response.cookies
+
+    # A new client stands in for another worker: it only knows what the cookie says.
+    client.cookies.clear()
+    client.cookies.set(db_session.READ_YOUR_WRITES_COOKIE, response.cookies[db_session.READ_YOUR_WRITES_COOKIE])
+    titles = [blog["title"] for blog in client.get("/api/v1/blogs/").json()["data"]]
+
+    assert titles == ["Fresh"]
+
+
+def test_stale_cookie_reads_from_the_replica(client, db, user, replica):
+    db.add(Blog(title="Only on the primary", content="...", author_id=user.id))
+    db.commit()
+    stale = db_session.time.time() - db_session.READ_YOUR_WRITES_SECONDS - 1
+    client.cookies.set(db_session.READ_YOUR_WRITES_COOKIE, f"{stale:.3f}")
+
+    assert client.get("/api/v1/blogs/").json()["data"] == []
+
+
+def test_reads_without_a_write_set_no_cookie(client, replica):
+    response = client.get("/api/v1/blogs/")
+
+    assert db_session.READ_YOUR_WRITES_COOKIE not in response.cookies
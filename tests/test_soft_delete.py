@@ -0,0 +1,86 @@
+import pytest
+
+from app.crud.user import delete_user
+from app.models.blog import Blog, BlogTombstone, Comment
+from app.models.user import User
+from app.tasks.purge import purge_deleted, purge_deleted_batch
+
+
+@pytest.fixture
+def low_threshold(monkeypatch):
+    monkeypatch.setattr("app.crud.blog.PURGE_THRESHOLD", 1)
+    monkeypatch.setattr("app.crud.user.PURGE_THRESHOLD", 1)
+
+
+def add_blog(db, user, comments=0):
+    blog = Blog(title="Big", content="...", author_id=user.id)
+    db.add(blog)
+    db.flush()
+    db.add_all(Comment(content=f"c{index}", user_id=user.id, blog_id=blog.id) for index in range(comments))
+    db.commit()
+    return blog
+
+
+def count(db, model):
+    return db.query(model).execution_options(include_deleted=True).count()
+
+
+def test_small_blog_is_deleted_at_once(client, db, auth_headers, user, low_threshold):
+    blog = add_blog(db, user, comments=1)
+
+    assert client.delete(f"/api/v1/blogs/{blog.id}", headers=auth_headers).status_code == 200
+
+    assert count(db, Blog) == 0
+    assert count(db, Comment) == 0
+
+
+def test_large_blog_is_hidden_then_purged_in_batches(client, db, auth_headers, user, low_threshold):
+    blog = add_blog(db, user, comments=5)
+
+    assert client.delete(f"/api/v1/blogs/{blog.id}", headers=auth_headers).status_code == 200
+
+    assert count(db, Blog) == 1
+    assert client.get(f"/api/v1/blogs/{blog.id}", headers=auth_headers).status_code == 404
+    assert client.delete(f"/api/v1/blogs/{blog.id}", headers=auth_headers).status_code == 404
+    assert db.query(BlogTombstone).filter_by(blog_id=blog.id).count() == 1
+
+    assert purge_deleted_batch(db, batch_size=2) == 2
+    assert count(db, Comment) == 3
+    assert purge_deleted(db, batch_size=2) == 4
+    assert count(db, Comment) == 0
+    assert count(db, Blog) == 0
+    assert purge_deleted_batch(db) == 0
+
+
+def test_large_account_is_hidden_then_purged(db, user, low_threshold):
+    blog = add_blog(db, user, comments=2)
+
+    delete_user(db, user.id)
+
+    assert db.query(User).filter_by(id=user.id).first() is None
+    assert db.query(Blog).filter_by(id=blog.id).first() is None
+    assert count(db, User) == 1
+
+    purge_deleted(db)
+
+    assert count(db, User) == 0
+    assert count(db, Blog) == 0
+    assert count(db, Comment) == 0
+
+
+def test_email_of_an_unpurged_account_is_still_taken(client, db, user, low_threshold):
+    add_blog(db, user, comments=2)
+    delete_user(db, user.id)
+
+    response = client.post(
+        "/api/v1/auth/register", json={"username": "alice2", "email": user.email, "password": "secret-password"}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+    purge_deleted(db)
+    response = client.post(
+        "/api/v1/auth/register", json={"username": "alice2", "email": user.email, "password": "secret-password"}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,15 @@
+"""Importing the app must stay cheap and side-effect free; measured in a fresh interpreter."""
+from benchmarks.startup import measure
+
+# Generous enough for a cold CI runner; an import that connects to the
+# database or a lifespan that blocks on the network blows well past these.
+MAX_IMPORT_MS = 5000
+MAX_LIFESPAN_MS = 1000
+
+
+def test_import_creates_no_engine_and_startup_stays_within_budget():
+    (sample,) = measure(runs=1)
+
+    assert sample["engine_created_on_import"] is False
+    assert sample["import_ms"] < MAX_IMPORT_MS
+    assert sample["lifespan_ms"] < MAX_LIFESPAN_MS